@@ -0,0 +1,99 @@
+import mmap
+from typing import Iterator
+
+from fastapi import APIRouter, HTTPException, Response, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+
+from app.schemas.calculation_schema import JobRequest, JobStatus
+from app.services.job_service import Job, job_manager
+
+router = APIRouter()
+
+# Bytes per chunk when streaming a result file
+DOWNLOAD_CHUNK = 1 << 20
+
+
+def _get_job(job_id: str) -> Job:
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND,
+                            detail=f"Unknown job {job_id}")
+    return job
+
+
+def _mapped_chunks(path: str) -> Iterator[bytes]:
+    """Stream a result file through a read-only memory map."""
+    with open(path, "rb") as handle, \
+            mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+        for offset in range(0, len(view), DOWNLOAD_CHUNK):
+            yield view[offset:offset + DOWNLOAD_CHUNK]
+
+
+@router.post(
+    "/",
+    response_model=JobStatus,
+    status_code=status.HTTP_202_ACCEPTED,
+    tags=["Jobs"],
+    summary="Submit a background calculation",
+    description="Queue an operation on a single `input` or a list of "
+                "`items` and return its job id immediately. Poll "
+                "`GET /jobs/{id}` and download `GET /jobs/{id}/result`. "
+                "Requires an `X-API-Key` header."
+)
+async def submit_job(req: JobRequest, response: Response):
+    try:
+        job = job_manager.submit(req.operation, req.input, req.items)
+    except ValidationError as e:
+        # Same 422 as the operation's own route for a malformed `input`
+        raise RequestValidationError([
+            {**error, "loc": ("body", "input", *error["loc"])}
+            for error in e.errors(include_url=False)
+        ]) from None
+    except ValueError as e:
+        raise HTTPException(
+            status.HTTP_400_BAD_REQUEST,
+            detail={
+                "operation": req.operation,
+                "input": req.input,
+                "result": None,
+                "status": "error",
+                "message": str(e),
+            }
+        )
+    response.headers["Location"] = f"/jobs/{job.id}"
+    return job
+
+
+@router.get(
+    "/{job_id}",
+    response_model=JobStatus,
+    tags=["Jobs"],
+    summary="Get background job status",
+)
+def get_job(job_id: str):
+    return _get_job(job_id)
+
+
+@router.get(
+    "/{job_id}/result",
+    tags=["Jobs"],
+    summary="Download a finished job's result",
+    description="Streams the stored JSON result. Returns 409 while the job "
+                "is still queued/running or if it failed.",
+    response_class=StreamingResponse,
+)
+def get_job_result(job_id: str):
+    job = _get_job(job_id)
+    if job.status != "done":
+        raise HTTPException(
+            status.HTTP_409_CONFLICT,
+            detail=f"Job is {job.status}"
+                   + (f": {job.message}" if job.status == "error" else ""),
+        )
+    return StreamingResponse(
+        _mapped_chunks(job.path),
+        media_type="application/json",
+        headers={"Content-Length": str(job.result_size)},
+    )
@@ -1,12 +1,9 @@
-from fastapi import APIRouter, Depends, Query
-from typing import List, Optional, cast
+from datetime import datetime
+from typing import List, Optional
 
-from sqlalchemy import desc
-from sqlalchemy.orm import Session
-from sqlalchemy.sql.elements import ColumnElement
+from fastapi import APIRouter, Query
 
-from app.database.db_connection import get_db
-from app.models.calculation_model import Request
+from app.database.db_connection import log_partitions
 from app.schemas.calculation_schema import CalculationResponse
 
 router = APIRouter()
@@ -18,7 +15,6 @@ router = APIRouter()
     tags=["Logs"],
     summary="Retrieve up to 300 logged API calls.")
 def get_logs(
-    db: Session = Depends(get_db),
     operation: Optional[str] = Query(
         None,
         description="Filter by operation (e.g. 'factorial', "
@@ -28,6 +24,14 @@ def get_logs(
         None,
         description="Filter by status (e.g. 'success' or 'error')"
     ),
+    since: Optional[datetime] = Query(
+        None,
+        description="Only calls at or after this time (ISO 8601, UTC)"
+    ),
+    until: Optional[datetime] = Query(
+        None,
+        description="Only calls at or before this time (ISO 8601, UTC)"
+    ),
     limit: int = Query(
         300,
         le=300,
@@ -36,17 +40,10 @@ def get_logs(
 ):
     """
     Returns the most recent logged API calls,
-    optionally filtered by operation and status.
+    optionally filtered by operation, status and time range.
+    Recent rows are served from the in-memory log buffer; otherwise
+    only the log partitions overlapping the time range are read.
     Requires an `X-API-Key` header.
     """
-    query = db.query(Request).order_by(
-        desc(cast(ColumnElement, Request.timestamp))
-    )
-
-    if operation:
-        query = query.filter_by(operation=operation)
-    if status:
-        query = query.filter_by(status=status)
-
-    results = query.limit(limit).all()
-    return results
+    return log_partitions.recent(limit, operation=operation, status=status,
+                                 since=since, until=until)
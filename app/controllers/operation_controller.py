@@ -0,0 +1,202 @@
+"""
+Router factory for registered math operations.
+
+For every `Operation` in the registry this module builds an APIRouter with
+  • POST /         – single calculation (201, body = request schema)
+  • POST /batch    – many inputs answered by the vectorised kernel
+  • GET  /         – same as POST / but with query parameters and
+                     HTTP caching headers (Cache-Control + weak ETag);
+                     responses are kept in `response_cache` for max-age
+                     (hits are still logged)
+  • GET  /range    – only for operations with a sequence generator;
+                     streams consecutive terms as NDJSON
+"""
+
+import hashlib
+import json
+from typing import Annotated, Any, Dict, Iterator, NoReturn, Tuple
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+
+from app.core.app_config import COMPRESSION_MIN_SIZE
+from app.core.compression import choose_encoding, compress, response_cache
+from app.core.metrics import RESPONSE_CACHE_READS
+from app.schemas.calculation_schema import (BatchRequest,
+                                            BatchResponse,
+                                            CalculationResponse)
+from app.services.math_service import log_value
+from app.services.operation_registry import Operation
+
+# Terms per streamed chunk; keeps per-chunk overhead low on long ranges
+RANGE_CHUNK_TERMS = 64
+
+
+def _bad_request(operation: str, payload: Dict[str, Any],
+                 error: ValueError) -> NoReturn:
+    """Raise the 400 error body shared by every math endpoint."""
+    raise HTTPException(
+        status.HTTP_400_BAD_REQUEST,
+        detail={
+            "operation": operation,
+            "input": payload,
+            "result": None,
+            "status": "error",
+            "message": str(error),
+        }
+    )
+
+
+def _etag(operation: str, payload: Dict[str, Any]) -> str:
+    """Weak ETag: results are a pure function of operation + input."""
+    key = json.dumps([operation, payload], sort_keys=True)
+    return 'W/"' + hashlib.sha1(key.encode()).hexdigest()[:20] + '"'
+
+
+def _ndjson_chunks(op: Operation,
+                   terms: Iterator[Tuple[int, Any]]) -> Iterator[bytes]:
+    """Encode (n, value) pairs as NDJSON lines, grouped into chunks."""
+    lines = []
+    for n, value in terms:
+        lines.append(json.dumps({"n": n, "result": op.format_result(value)}))
+        if len(lines) == RANGE_CHUNK_TERMS:
+            yield ("\n".join(lines) + "\n").encode()
+            lines.clear()
+    if lines:
+        yield ("\n".join(lines) + "\n").encode()
+
+
+def build_router(op: Operation) -> APIRouter:
+    """Generate the single, batch and GET-cacheable routes for `op`."""
+    # The handlers are plain functions: FastAPI runs them in its threadpool,
+    # so a long kernel (up to the cost budget) never blocks the event loop
+    router = APIRouter()
+    request_model = op.request_model
+    batch_model = BatchRequest[request_model]  # type: ignore[valid-type]
+
+    def _calculate(
+            payload: Dict[str, Any]) -> Tuple[CalculationResponse, Any]:
+        """Response body and raw result of one logged calculation."""
+        try:
+            result = op.calculate(payload)
+        except ValueError as e:
+            _bad_request(op.name, payload, e)
+        return CalculationResponse(
+            operation=op.name,
+            input=payload,
+            result=op.format_result(result),
+            status="success",
+            message=op.message,
+        ), result
+
+    @router.post(
+        "/",
+        response_model=CalculationResponse,
+        status_code=status.HTTP_201_CREATED,
+        summary=op.summary,
+        description=f"{op.description} Returns 400 if the input is out of "
+                    f"range. Requires an `X-API-Key` header.",
+        name=f"{op.name}_endpoint",
+    )
+    def single_endpoint(req: request_model):  # type: ignore[valid-type]
+        return _calculate(req.model_dump(exclude_defaults=True))[0]
+
+    @router.post(
+        "/batch",
+        response_model=BatchResponse,
+        status_code=status.HTTP_201_CREATED,
+        summary=f"{op.summary} (batch)",
+        description=f"{op.description} Accepts a list of inputs and "
+                    f"answers them in one pass. Returns 400 if any item is "
+                    f"out of range. Requires an `X-API-Key` header.",
+        name=f"{op.name}_batch_endpoint",
+    )
+    def batch_endpoint(req: batch_model):  # type: ignore[valid-type]
+        payloads = [item.model_dump(exclude_defaults=True)
+                    for item in req.items]
+        try:
+            results = op.calculate_batch(payloads)
+        except ValueError as e:
+            _bad_request(f"{op.name}.batch", {"items": payloads}, e)
+        return BatchResponse(
+            operation=f"{op.name}.batch",
+            input={"items": payloads},
+            results=[op.format_result(result) for result in results],
+            status="success",
+            message=f"Batch of {len(payloads)} calculated successfully",
+        )
+
+    @router.get(
+        "/",
+        response_model=CalculationResponse,
+        summary=f"{op.summary} (cacheable)",
+        description=f"{op.description} Same as the POST route, but takes "
+                    f"query parameters and sends Cache-Control/ETag headers "
+                    f"so clients and proxies can reuse the result. "
+                    f"Requires an `X-API-Key` header.",
+        name=f"{op.name}_get_endpoint",
+    )
+    def get_endpoint(
+            request: Request,
+            req: Annotated[request_model, Query()],  # type: ignore
+    ):
+        payload = req.model_dump(exclude_defaults=True)
+        etag = _etag(op.name, payload)
+        headers = {
+            "Cache-Control": f"public, max-age={op.cache_max_age}",
+            "ETag": etag,
+        }
+        # The ETag depends on the input only: revalidation never computes
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED,
+                            headers=headers)
+        # Repeated GETs reuse the serialized body (and its compressed
+        # variants) for max-age seconds, timestamp included, like a proxy
+        # hit. The call is still logged, with the cached result.
+        cached = response_cache.lookup(etag)
+        if cached is not None:
+            body, logged = cached
+            RESPONSE_CACHE_READS.inc((op.name, "hit"))
+            op.log_cached(payload, logged)
+        else:
+            RESPONSE_CACHE_READS.inc((op.name, "miss"))
+            model, result = _calculate(payload)
+            body = model.model_dump_json().encode()
+            response_cache.put(etag, body, op.cache_max_age,
+                               meta=log_value(result))
+        headers["Vary"] = "Accept-Encoding"
+        encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+        if encoding is not None and len(body) >= COMPRESSION_MIN_SIZE:
+            encoded = response_cache.get(etag, encoding)
+            body = compress(body, encoding) if encoded is None else encoded
+            headers["Content-Encoding"] = encoding
+        return Response(body, media_type="application/json", headers=headers)
+
+    if op.sequence is None:
+        return router
+
+    @router.get(
+        "/range",
+        summary=f"{op.summary} (range)",
+        description=f"Stream {op.name}(n) for n in range(start, stop, step) "
+                    f"as newline-delimited JSON. Terms are generated "
+                    f"incrementally and the whole range is logged as one "
+                    f"record. Requires an `X-API-Key` header.",
+        response_class=StreamingResponse,
+        name=f"{op.name}_range_endpoint",
+    )
+    def range_endpoint(
+            stop: int = Query(..., description="End of the range "
+                                               "(exclusive)"),
+            start: int = Query(0, description="First n (inclusive)"),
+            step: int = Query(1, description="Distance between terms"),
+    ):
+        try:
+            terms = op.calculate_range(start, stop, step)
+        except ValueError as e:
+            _bad_request(f"{op.name}.range",
+                         {"start": start, "stop": stop, "step": step}, e)
+        return StreamingResponse(_ndjson_chunks(op, terms),
+                                 media_type="application/x-ndjson")
+
+    return router
@@ -1,27 +1,204 @@
-from fastapi import HTTPException, Security, status
-from fastapi.security.api_key import APIKeyHeader
+"""
+API-key authentication.
 
-from app.core.app_config import API_KEY
+Keys are kept in an in-memory index keyed by their SHA-256 digest, so
+the server never stores or compares plaintext keys and a lookup is a
+single hash + dict access regardless of how many keys exist. Hashing
+before the lookup is what keeps it safe against timing attacks: the
+comparison only ever sees digests, never the presented key.
 
-# Define the header name expected in each request
-api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
+Key sources:
+  • API_KEY          – the legacy shared key (all scopes), always loaded
+  • API_KEYS_FILE    – optional JSON file, hot-reloaded when it changes:
 
+        {"keys": [{"id": "dashboard",
+                   "sha256": "<hex digest of the key>",
+                   "scopes": ["logs", "metrics"],
+                   "metadata": {"owner": "ops"}}]}
 
-def verify_api_key(api_key: str = Security(api_key_header)) -> None:
+Scopes are derived from the first path segment ("logs", "metrics", ...);
+everything else needs "math". The scope "*" grants every route.
+
+Authentication runs as plain ASGI middleware in front of the router
+instead of a per-route FastAPI dependency.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Iterable, Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.app_config import API_KEY, API_KEYS_FILE, API_KEYS_RELOAD_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Header name expected in each request (lower-case, as in ASGI scopes)
+API_KEY_HEADER = b"x-api-key"
+# Routes reachable without a key
+PUBLIC_PATHS = frozenset({"/", "/docs", "/docs/oauth2-redirect", "/redoc",
+                          "/openapi.json"})
+# First path segment -> required scope; anything else needs "math"
+PATH_SCOPES = {"logs": "logs", "metrics": "metrics"}
+DEFAULT_SCOPE = "math"
+ALL_SCOPES = "*"
+
+
+def hash_key(api_key: str) -> str:
+    """Hex SHA-256 digest stored in the key file for `api_key`."""
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+@dataclass(frozen=True)
+class KeyRecord:
+    """One API key as seen by the application (never the plaintext)."""
+    key_id: str
+    digest: str
+    scopes: FrozenSet[str]
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    def allows(self, scope: str) -> bool:
+        return ALL_SCOPES in self.scopes or scope in self.scopes
+
+
+class APIKeyStore:
+    """In-memory index of hashed keys, reloaded when the file changes."""
+
+    def __init__(self, path: str = "", legacy_key: Optional[str] = None,
+                 reload_seconds: float = 2.0) -> None:
+        self.path = path
+        self.legacy_key = legacy_key
+        self.reload_seconds = reload_seconds
+        self._index: Dict[str, KeyRecord] = {}
+        self._mtime: Optional[int] = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self.reload()
+
+    def _records(self) -> Iterable[KeyRecord]:
+        if self.legacy_key:
+            yield KeyRecord("default", hash_key(self.legacy_key),
+                            frozenset({ALL_SCOPES}))
+        if not self.path:
+            return
+        with open(self.path, encoding="utf-8") as handle:
+            entries = json.load(handle).get("keys", [])
+        for entry in entries:
+            yield KeyRecord(
+                key_id=str(entry["id"]),
+                digest=str(entry["sha256"]).lower(),
+                scopes=frozenset(entry.get("scopes", [DEFAULT_SCOPE])),
+                metadata=dict(entry.get("metadata", {})),
+            )
+
+    def reload(self) -> None:
+        """Rebuild the index; keep the previous one if the file is bad."""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns if self.path else None
+            index = {record.digest: record for record in self._records()}
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.error("Could not load API keys from %s: %s",
+                         self.path, e)
+            return
+        # Swapping the dict is atomic; readers never see a partial index
+        self._index = index
+        self._mtime = mtime
+
+    def maybe_reload(self) -> None:
+        """Re-read the key file if it changed (checked at most every
+        `reload_seconds`)."""
+        if not self.path:
+            return
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        with self._lock:
+            if now < self._next_check:
+                return
+            self._next_check = now + self.reload_seconds
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except OSError:
+                return
+            if mtime != self._mtime:
+                self.reload()
+
+    def lookup(self, api_key: str) -> Optional[KeyRecord]:
+        """Record for `api_key`, or None if it is not a known key."""
+        self.maybe_reload()
+        return self._index.get(hash_key(api_key))
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+# Process-wide key store
+key_store = APIKeyStore(API_KEYS_FILE, legacy_key=API_KEY,
+                        reload_seconds=API_KEYS_RELOAD_SECONDS)
+
+
+def required_scope(path: str) -> str:
+    """Scope needed for `path`, from its first segment."""
+    return PATH_SCOPES.get(path.lstrip("/").split("/", 1)[0], DEFAULT_SCOPE)
+
+
+class APIKeyMiddleware:
     """
-    Dependency that checks if the request includes a valid X-API-Key header.
-    - Raises 401 if the header is missing.
-    - Raises 403 if the header is present but incorrect.
+    ASGI middleware that checks the X-API-Key header on every non-public
+    HTTP request.
+    - Responds 401 if the header is missing.
+    - Responds 403 if the key is unknown or lacks the route's scope.
+    On success the KeyRecord is stored in `request.state.api_key`.
     """
-    if api_key is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing X-API-Key header",
-            headers={"WWW-Authenticate": "API Key"},
-        )
-
-    if api_key != API_KEY:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Invalid API key",
-        )
+
+    def __init__(self, app: ASGIApp, store: Optional[APIKeyStore] = None):
+        self.app = app
+        self.store = store or key_store
+
+    async def __call__(self, scope: Scope, receive: Receive,
+                       send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in PUBLIC_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        api_key = None
+        for name, value in scope["headers"]:
+            if name == API_KEY_HEADER:
+                api_key = value.decode("latin-1")
+                break
+
+        if api_key is None:
+            response = JSONResponse(
+                {"detail": "Missing X-API-Key header"},
+                status_code=401,
+                headers={"WWW-Authenticate": "API Key"},
+            )
+            await response(scope, receive, send)
+            return
+
+        record = self.store.lookup(api_key)
+        if record is None:
+            response = JSONResponse({"detail": "Invalid API key"},
+                                    status_code=403)
+            await response(scope, receive, send)
+            return
+
+        needed = required_scope(scope["path"])
+        if not record.allows(needed):
+            response = JSONResponse(
+                {"detail": f"API key lacks the '{needed}' scope"},
+                status_code=403,
+            )
+            await response(scope, receive, send)
+            return
+
+        scope.setdefault("state", {})["api_key"] = record
+        await self.app(scope, receive, send)
@@ -9,3 +9,42 @@ load_dotenv(dotenv_path=Path(__file__).resolve().parents[2] / ".env")
 API_KEY: str = os.getenv("API_KEY", "default_key")
 DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./app/database.db")
 DEBUG: bool = os.getenv("DEBUG", "False").lower() in ("true", "1", "yes")
+
+# Request-log partitioning: one table per "day" or "week";
+# partitions older than LOG_RETENTION_DAYS are dropped (0 = keep forever)
+LOG_PARTITION_INTERVAL: str = os.getenv("LOG_PARTITION_INTERVAL", "day")
+LOG_RETENTION_DAYS: int = int(os.getenv("LOG_RETENTION_DAYS", "30"))
+# Newest request-log rows mirrored in memory for /logs (0 rows = off;
+# 0 minutes = no age limit)
+LOG_BUFFER_ROWS: int = int(os.getenv("LOG_BUFFER_ROWS", "10000"))
+LOG_BUFFER_MINUTES: int = int(os.getenv("LOG_BUFFER_MINUTES", "60"))
+
+# Optional JSON file with many hashed API keys (see app/core/api_security.py);
+# it is re-read automatically when it changes
+API_KEYS_FILE: str = os.getenv("API_KEYS_FILE", "")
+API_KEYS_RELOAD_SECONDS: float = float(
+    os.getenv("API_KEYS_RELOAD_SECONDS", "2")
+)
+
+# Background jobs (POST /jobs): worker processes, where results are kept,
+# how many finished jobs are remembered and how much larger a job's cost
+# budget is than a synchronous call's
+JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", str(os.cpu_count() or 2)))
+JOB_RESULT_DIR: str = os.getenv("JOB_RESULT_DIR", "./app/job_results")
+JOB_HISTORY: int = int(os.getenv("JOB_HISTORY", "1000"))
+JOB_COST_FACTOR: int = int(os.getenv("JOB_COST_FACTOR", "20"))
+
+# /metrics re-renders the Prometheus exposition at most this often
+METRICS_CACHE_SECONDS: float = float(os.getenv("METRICS_CACHE_SECONDS", "5"))
+
+# Response compression: bodies below COMPRESSION_MIN_SIZE bytes are sent
+# as they are; compressed cacheable GET responses are kept in memory up to
+# COMPRESSION_CACHE_BYTES
+COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1000"))
+COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY: int = int(
+    os.getenv("COMPRESSION_BROTLI_QUALITY", "4")
+)
+COMPRESSION_CACHE_BYTES: int = int(
+    os.getenv("COMPRESSION_CACHE_BYTES", str(32 * 1024 * 1024))
+)
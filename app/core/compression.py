@@ -0,0 +1,287 @@
+"""
+Negotiated response compression (gzip, and brotli when installed).
+
+`CompressionMiddleware` encodes JSON, NDJSON and text responses with the
+best encoding the client accepts (Accept-Encoding, q-values honoured;
+br is preferred over gzip on ties):
+
+  • complete bodies are compressed in one go when they are at least
+    COMPRESSION_MIN_SIZE bytes, smaller ones are sent as they are;
+  • streamed bodies (/range, job downloads) are compressed chunk by
+    chunk and flushed after every chunk, so clients keep receiving
+    terms progressively;
+  • responses that already carry a Content-Encoding pass through; the
+    cacheable GET routes use this to send the precompressed variants
+    kept in `ResponseCache`.
+
+Brotli is optional: `pip install brotli` enables it.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.app_config import (COMPRESSION_BROTLI_QUALITY,
+                                 COMPRESSION_CACHE_BYTES,
+                                 COMPRESSION_GZIP_LEVEL,
+                                 COMPRESSION_MIN_SIZE)
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+# Encodings in order of preference when the client rates them equally
+SUPPORTED = ("br", "gzip") if brotli is not None else ("gzip",)
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/x-ndjson",
+                      "application/problem+json")
+
+
+def choose_encoding(accept_encoding: str,
+                    supported: Tuple[str, ...] = SUPPORTED) -> Optional[str]:
+    """Best encoding from an Accept-Encoding header, or None."""
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip()] = q
+    best, best_q = None, 0.0
+    for encoding in supported:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class Encoder:
+    """Incremental encoder for one response body."""
+
+    def __init__(self, encoding: str) -> None:
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(
+                quality=COMPRESSION_BROTLI_QUALITY)
+        else:
+            self._zlib = zlib.compressobj(COMPRESSION_GZIP_LEVEL,
+                                          zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data: bytes) -> bytes:
+        """Compress `data` and flush it so it can be sent right away."""
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.finish()
+        return self._zlib.compress(data) + self._zlib.flush()
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    return Encoder(encoding).finish(data)
+
+
+class ResponseCache:
+    """
+    Serialized cacheable responses keyed by ETag, together with their
+    compressed variants (created on first request per encoding) and an
+    opaque `meta` value from the caller. Entries live for the route's
+    max-age; total size is bounded, LRU first.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        # etag -> (expires, {encoding or "identity": body}, meta)
+        self._entries: \
+            "OrderedDict[str, Tuple[float, Dict[str, bytes], Any]]" \
+            = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, etag: str) -> Optional[Tuple[bytes, Any]]:
+        """Uncompressed body and meta of a live entry, or None."""
+        with self._lock:
+            entry = self._live(etag)
+            if entry is None:
+                return None
+            return entry[1]["identity"], entry[2]
+
+    def get(self, etag: str, encoding: str = "identity") -> Optional[bytes]:
+        """Stored body in `encoding`, compressing it on first use."""
+        with self._lock:
+            entry = self._live(etag)
+            if entry is None:
+                return None
+            bodies = entry[1]
+            body = bodies.get(encoding)
+            identity = bodies["identity"]
+        if body is None:
+            body = compress(identity, encoding)
+            with self._lock:
+                if self._entries.get(etag) is entry:
+                    bodies[encoding] = body
+                    self._size += len(body)
+                    self._trim()
+        return body
+
+    def put(self, etag: str, body: bytes, max_age: int,
+            meta: Any = None) -> None:
+        if max_age <= 0 or len(body) > self.max_bytes:
+            return
+        with self._lock:
+            if etag in self._entries:
+                self._remove(etag)
+            self._entries[etag] = (time.monotonic() + max_age,
+                                   {"identity": body}, meta)
+            self._size += len(body)
+            self._trim()
+
+    def _live(self, etag: str
+              ) -> Optional[Tuple[float, Dict[str, bytes], Any]]:
+        # Caller holds the lock
+        entry = self._entries.get(etag)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            self._remove(etag)
+            return None
+        self._entries.move_to_end(etag)
+        return entry
+
+    def _trim(self) -> None:
+        while self._size > self.max_bytes and self._entries:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, etag: str) -> None:
+        bodies = self._entries.pop(etag)[1]
+        self._size -= sum(len(body) for body in bodies.values())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Process-wide cache of cacheable GET responses (see operation_controller)
+response_cache = ResponseCache(COMPRESSION_CACHE_BYTES)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses the client can decode.
+    Responses that already carry a Content-Encoding, non-text types,
+    HEAD requests and bodies below `min_size` pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp,
+                 min_size: int = COMPRESSION_MIN_SIZE) -> None:
+        self.app = app
+        self.min_size = min_size
+
+    async def __call__(self, scope: Scope, receive: Receive,
+                       send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(
+            Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressingResponder(self, scope, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressingResponder:
+    """Per-request state of CompressionMiddleware."""
+
+    def __init__(self, middleware: CompressionMiddleware, scope: Scope,
+                 encoding: str, send: Send) -> None:
+        self.middleware = middleware
+        self.scope = scope
+        self.encoding = encoding
+        self._send = send
+        self.start: Optional[Message] = None
+        self.encoder: Optional[Encoder] = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self._on_start(message)
+            if self.passthrough:
+                await self._send(message)
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.encoder is None:
+            if not more_body:
+                await self._send_whole(body)
+                return
+            await self._begin_stream()
+        assert self.encoder is not None
+        if more_body:
+            data = self.encoder.chunk(body)
+            if data:
+                await self._send({"type": "http.response.body",
+                                  "body": data, "more_body": True})
+            return
+        await self._send({"type": "http.response.body",
+                          "body": self.encoder.finish(body),
+                          "more_body": False})
+
+    def _on_start(self, message: Message) -> None:
+        headers = Headers(raw=message["headers"])
+        content_type = headers.get("content-type", "")
+        length = headers.get("content-length")
+        compressible = content_type.startswith(COMPRESSIBLE_TYPES)
+        if compressible and "accept-encoding" not in headers.get(
+                "vary", "").lower():
+            MutableHeaders(raw=message["headers"]).add_vary_header(
+                "Accept-Encoding")
+        if (not compressible or "content-encoding" in headers
+                or not 200 <= message["status"] < 300
+                or message["status"] == 204
+                or (length is not None
+                    and int(length) < self.middleware.min_size)):
+            self.passthrough = True
+            return
+        self.start = message
+
+    def _encoded_start(self, length: Optional[int]) -> Message:
+        assert self.start is not None
+        headers = MutableHeaders(raw=self.start["headers"])
+        headers["Content-Encoding"] = self.encoding
+        if length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(length)
+        return self.start
+
+    async def _send_whole(self, body: bytes) -> None:
+        assert self.start is not None
+        if len(body) < self.middleware.min_size:
+            await self._send(self.start)
+            await self._send({"type": "http.response.body", "body": body})
+            return
+        data = compress(body, self.encoding)
+        await self._send(self._encoded_start(len(data)))
+        await self._send({"type": "http.response.body", "body": data})
+
+    async def _begin_stream(self) -> None:
+        self.encoder = Encoder(self.encoding)
+        await self._send(self._encoded_start(None))
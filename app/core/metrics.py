@@ -0,0 +1,269 @@
+"""
+Low-overhead in-process metrics.
+
+The request path only touches thread-local state: every thread owns a
+shard (a plain dict per metric) and increments it without locks. Shards
+are summed lazily when Prometheus scrapes, and the rendered exposition
+text is cached for METRICS_CACHE_SECONDS, so frequent or parallel
+scrapes cost one `generate_latest` per interval at most.
+
+Exported metrics
+  • http_requests_total{method, handler, status}
+  • http_request_duration_seconds{method, handler}   (histogram)
+  • math_kernel_seconds{operation}                    (histogram)
+  • math_kernel_cache_{hits,misses}_total{kernel}     (from lru_cache)
+  • math_log_write_seconds                            (histogram)
+  • math_log_buffer_reads_total{result}               (hit / miss)
+  • math_response_cache_reads_total{operation, result}   (hit / miss)
+plus everything else registered with prometheus_client (process metrics
+and the job metrics, including math_jobs_queue_depth).
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from prometheus_client import REGISTRY, generate_latest
+from prometheus_client.core import (CounterMetricFamily,
+                                    HistogramMetricFamily)
+from prometheus_client.registry import Collector
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.app_config import METRICS_CACHE_SECONDS
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Sharded:
+    """Base class: one dict per thread, registered once per thread."""
+
+    def __init__(self, name: str, documentation: str,
+                 labelnames: Tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._local = threading.local()
+        self._shards: List[Dict[LabelValues, Any]] = []
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> Dict[LabelValues, Any]:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard: Dict[LabelValues, Any] = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def _snapshot(self) -> List[Dict[LabelValues, Any]]:
+        with self._shards_lock:
+            return list(self._shards)
+
+
+class ShardedCounter(_Sharded):
+    """Monotonic counter with per-thread shards."""
+
+    def inc(self, labels: LabelValues = (), amount: float = 1.0) -> None:
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0.0) + amount
+
+    def totals(self) -> Dict[LabelValues, float]:
+        totals: Dict[LabelValues, float] = {}
+        for shard in self._snapshot():
+            for labels, value in list(shard.items()):
+                totals[labels] = totals.get(labels, 0.0) + value
+        return totals
+
+    def collect(self) -> CounterMetricFamily:
+        family = CounterMetricFamily(self.name, self.documentation,
+                                     labels=self.labelnames)
+        for labels, value in self.totals().items():
+            family.add_metric(labels, value)
+        return family
+
+
+class ShardedHistogram(_Sharded):
+    """Fixed-bucket histogram with per-thread shards."""
+
+    def __init__(self, name: str, documentation: str,
+                 labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = buckets
+
+    def observe(self, value: float, labels: LabelValues = ()) -> None:
+        shard = self._shard()
+        cell = shard.get(labels)
+        if cell is None:
+            # [count per bucket..., +Inf count, sum]
+            cell = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        cell[bisect_left(self.buckets, value)] += 1
+        cell[-1] += value
+
+    def totals(self) -> Dict[LabelValues, List[float]]:
+        totals: Dict[LabelValues, List[float]] = {}
+        for shard in self._snapshot():
+            for labels, cell in list(shard.items()):
+                acc = totals.get(labels)
+                if acc is None:
+                    totals[labels] = list(cell)
+                else:
+                    for i, value in enumerate(cell):
+                        acc[i] += value
+        return totals
+
+    def collect(self) -> HistogramMetricFamily:
+        family = HistogramMetricFamily(self.name, self.documentation,
+                                       labels=self.labelnames)
+        bounds = [str(b) for b in self.buckets] + ["+Inf"]
+        for labels, cell in self.totals().items():
+            cumulative, running = [], 0
+            for bound, count in zip(bounds, cell[:-1]):
+                running += count
+                cumulative.append((bound, running))
+            family.add_metric(list(labels), cumulative, sum_value=cell[-1])
+        return family
+
+
+# Domain + HTTP metrics
+HTTP_REQUESTS = ShardedCounter(
+    "http_requests_total", "HTTP requests by handler and status",
+    ("method", "handler", "status"))
+HTTP_LATENCY = ShardedHistogram(
+    "http_request_duration_seconds", "HTTP request latency",
+    ("method", "handler"))
+KERNEL_SECONDS = ShardedHistogram(
+    "math_kernel_seconds", "Time spent in math kernels", ("operation",))
+LOG_WRITE_SECONDS = ShardedHistogram(
+    "math_log_write_seconds", "Time spent writing one request-log row")
+LOG_BUFFER_READS = ShardedCounter(
+    "math_log_buffer_reads", "/logs queries answered from the in-memory "
+    "buffer (hit) or the database (miss)", ("result",))
+RESPONSE_CACHE_READS = ShardedCounter(
+    "math_response_cache_reads", "Cacheable GET responses served from the "
+    "response cache (hit) or computed (miss)", ("operation", "result"))
+
+# lru_cache-wrapped kernels whose hit/miss counters are exported
+_cached_kernels: Dict[str, Callable[..., Any]] = {}
+
+
+def register_cached_kernel(name: str, function: Callable[..., Any]) -> None:
+    """Export hits/misses of an lru_cache-wrapped function."""
+    _cached_kernels[name] = function
+
+
+class FastMetricsCollector(Collector):
+    """Aggregates the sharded metrics when the registry is scraped."""
+
+    def collect(self) -> Iterator[Any]:
+        for metric in (HTTP_REQUESTS, HTTP_LATENCY, KERNEL_SECONDS,
+                       LOG_WRITE_SECONDS, LOG_BUFFER_READS,
+                       RESPONSE_CACHE_READS):
+            yield metric.collect()
+        hits = CounterMetricFamily("math_kernel_cache_hits",
+                                   "lru_cache hits per kernel",
+                                   labels=("kernel",))
+        misses = CounterMetricFamily("math_kernel_cache_misses",
+                                     "lru_cache misses per kernel",
+                                     labels=("kernel",))
+        for name, function in _cached_kernels.items():
+            info = function.cache_info()  # type: ignore[attr-defined]
+            hits.add_metric((name,), info.hits)
+            misses.add_metric((name,), info.misses)
+        yield hits
+        yield misses
+
+
+REGISTRY.register(FastMetricsCollector())
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Full path template ("/jobs/{job_id}") of the route that handled the
+    request, or "none" when nothing matched.
+
+    This is normally `route.path`: FastAPI copies the routes of an
+    included router with the prefix applied. Versions that keep included
+    routers wrapped (0.14x) report the router-local path instead ("/"
+    for POST /factorial/); then the static prefix in front of the part
+    matched by the route is re-attached.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    regex = getattr(route, "path_regex", None)
+    if not template or regex is None:
+        return "none"
+    path = scope["path"]
+    if regex.match(path):
+        return template
+    cut = path.find("/", 1)
+    while cut != -1:
+        if regex.match(path[cut:]):
+            return path[:cut] + template
+        cut = path.find("/", cut + 1)
+    return template
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request count and latency per route
+    template. Unmatched paths share the handler label "none" so label
+    cardinality stays bounded.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive,
+                       send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            handler = route_template(scope)
+            method = scope["method"]
+            HTTP_LATENCY.observe(time.perf_counter() - start,
+                                 (method, handler))
+            HTTP_REQUESTS.inc((method, handler, str(status)))
+
+
+class ExpositionCache:
+    """generate_latest() at most once per `ttl` seconds."""
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self._body = b""
+        self._expires = 0.0
+        self._lock = threading.Lock()
+
+    def render(self) -> bytes:
+        now = time.monotonic()
+        if now < self._expires:
+            return self._body
+        with self._lock:
+            if now >= self._expires:
+                self._body = generate_latest(REGISTRY)
+                self._expires = time.monotonic() + self.ttl
+            return self._body
+
+
+exposition = ExpositionCache(METRICS_CACHE_SECONDS)
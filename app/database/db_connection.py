@@ -1,7 +1,13 @@
+from datetime import timedelta
+
 from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.engine import Engine
 
-from app.core.app_config import DATABASE_URL
+from app.core.app_config import (DATABASE_URL, LOG_BUFFER_MINUTES,
+                                 LOG_BUFFER_ROWS, LOG_PARTITION_INTERVAL,
+                                 LOG_RETENTION_DAYS)
+from app.database.log_buffer import LogBuffer
+from app.database.log_partitions import LogPartitions
 
 # Create the SQLAlchemy engine
 engine = create_engine(
@@ -12,38 +18,46 @@ engine = create_engine(
     echo=False,
 )
 
-# Session factory (synchronous)
-SessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    bind=engine,
-)
 
-# Base class for ORM models
-Base = declarative_base()
+def _read_only_engine(write_engine: Engine) -> Engine:
+    """
+    Separate read-only connection pool for analytics reads of a SQLite
+    file (other databases, and in-memory SQLite, reuse `write_engine`).
+    """
+    url = write_engine.url
+    if url.get_backend_name() != "sqlite" or \
+            url.database in (None, "", ":memory:"):
+        return write_engine
+    return create_engine(
+        url.set(database=f"file:{url.database}",
+                query={"mode": "ro", "uri": "true"}),
+        connect_args={"check_same_thread": False},
+        echo=False,
+    )
+
+
+# Time-partitioned request log (one table per day/week), with the newest
+# rows mirrored in memory for /logs
+log_partitions = LogPartitions(
+    engine,
+    interval=LOG_PARTITION_INTERVAL,
+    retention_days=LOG_RETENTION_DAYS,
+    buffer=LogBuffer(
+        LOG_BUFFER_ROWS,
+        max_age=timedelta(minutes=LOG_BUFFER_MINUTES)
+        if LOG_BUFFER_MINUTES > 0 else None,
+    ) if LOG_BUFFER_ROWS > 0 else None,
+    read_engine=_read_only_engine(engine),
+)
 
 
 # Initialize the database
-#   – Creates the file and the “requests” table on first run
+#   – Creates the file on first run, discovers existing log partitions,
+#     migrates a legacy `requests` table and drops the partitions past
+#     the retention period
 def init_db() -> None:
     """
     Call this once at application startup to create the SQLite file
-    and all tables declared in SQLAlchemy models.
-    """
-    # Import models here so they are registered before create_all()
-    from app.models import calculation_model  # noqa: F401
-
-    Base.metadata.create_all(bind=engine)
-
-
-# FastAPI dependency that yields a DB session
-def get_db():
-    """
-    FastAPI dependency:
-    Opens a database session and closes it after the request.
+    and load the request-log partitions.
     """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+    log_partitions.load()
@@ -0,0 +1,133 @@
+"""
+In-memory mirror of the newest request-log rows.
+
+`LogPartitions.insert` appends every committed row to a `LogBuffer`, a
+bounded deque of compact `__slots__` records kept in timestamp order.
+`/logs` queries are answered from it whenever the buffer provably holds
+the answer:
+
+  • it found `limit` matching rows (they are the newest ones), or
+  • the query's `since` lies inside the covered window, or
+  • nothing has ever been evicted (the buffer holds the whole log).
+
+Everything else falls back to the database. The buffer reflects the
+writes of this process only; run with LOG_BUFFER_ROWS=0 when several
+server processes share one database.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+
+class LogRecord:
+    """One log row; attribute names match the partition columns."""
+    __slots__ = ("operation", "input", "result", "timestamp", "status",
+                 "message")
+
+    def __init__(self, operation: str, input: Dict[str, Any],
+                 result: Optional[float], timestamp: datetime, status: str,
+                 message: Optional[str] = None) -> None:
+        self.operation = operation
+        self.input = input
+        self.result = result
+        self.timestamp = timestamp
+        self.status = status
+        self.message = message
+
+    @classmethod
+    def from_row(cls, row: Any) -> "LogRecord":
+        return cls(row.operation, row.input, row.result, row.timestamp,
+                   row.status, row.message)
+
+
+class LogBuffer:
+    """
+    Newest `capacity` rows, optionally no older than `max_age` before
+    the newest one. Timestamps are naive UTC, as in the database.
+    """
+
+    def __init__(self, capacity: int,
+                 max_age: Optional[timedelta] = None) -> None:
+        self.capacity = capacity
+        self.max_age = max_age
+        self._records: Deque[LogRecord] = deque()
+        # Every row newer than `horizon` is in the buffer;
+        # None means no row has been evicted yet
+        self.horizon: Optional[datetime] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def seed(self, rows: Iterable[Any], horizon: Optional[datetime]) -> None:
+        """Replace the contents with `rows` (newest first) from the DB."""
+        records = [LogRecord.from_row(row) for row in rows]
+        records.reverse()
+        with self._lock:
+            self._records = deque(records)
+            self.horizon = horizon
+
+    def append(self, row: Dict[str, Any]) -> None:
+        record = LogRecord(**row)
+        ts = record.timestamp
+        with self._lock:
+            records = self._records
+            if self.horizon is not None and ts <= self.horizon:
+                return  # already outside the mirrored window
+            # Concurrent writers may commit slightly out of order
+            position = len(records)
+            while position and records[position - 1].timestamp > ts:
+                position -= 1
+            if position == len(records):
+                records.append(record)
+            else:
+                records.insert(position, record)
+            self._evict(records[-1].timestamp)
+
+    def _evict(self, newest: datetime) -> None:
+        records = self._records
+        cutoff = newest - self.max_age if self.max_age else None
+        while records and (len(records) > self.capacity or
+                           (cutoff is not None and
+                            records[0].timestamp < cutoff)):
+            self.horizon = records.popleft().timestamp
+
+    def discard_before(self, ts: datetime) -> None:
+        """Forget rows older than `ts` (their partitions were dropped)."""
+        with self._lock:
+            records = self._records
+            while records and records[0].timestamp < ts:
+                records.popleft()
+
+    def query(self, limit: int, operation: Optional[str] = None,
+              status: Optional[str] = None,
+              since: Optional[datetime] = None,
+              until: Optional[datetime] = None) -> Optional[List[LogRecord]]:
+        """
+        Newest rows matching the filters, or None if rows outside the
+        buffer could belong to the answer.
+        """
+        with self._lock:
+            snapshot = list(self._records)
+            horizon = self.horizon
+        found: List[LogRecord] = []
+        for record in reversed(snapshot):
+            ts = record.timestamp
+            if until is not None and ts > until:
+                continue
+            if since is not None and ts < since:
+                break
+            if operation and record.operation != operation:
+                continue
+            if status and record.status != status:
+                continue
+            found.append(record)
+            if len(found) >= limit:
+                return found
+        if horizon is None or (since is not None and since > horizon):
+            return found
+        return None
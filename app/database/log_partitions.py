@@ -0,0 +1,303 @@
+"""
+Time-partitioned storage for the request log.
+
+Instead of one ever-growing `requests` table, each day (or ISO week) gets
+its own table, `requests_YYYYMMDD`, named after the first day it covers.
+
+  • Inserts go to the partition of the current period; the Table object
+    for that period is cached, so the hot path is a single INSERT.
+  • Retention drops whole partitions (DROP TABLE) instead of deleting
+    rows, so writers are never blocked by a long DELETE. On SQLite the
+    freed pages are returned with `PRAGMA incremental_vacuum`.
+  • Queries walk only the partitions that overlap the requested time
+    range, newest first, and stop as soon as `limit` rows are collected.
+  • With a `LogBuffer`, recent queries are answered from memory; the
+    rest go through `read_engine` (a read-only connection on SQLite,
+    which runs in WAL mode so readers never block the insert path).
+
+A `requests` table from before partitioning is migrated on `load()`: its
+rows are copied into the partitions of their timestamps and it is dropped.
+"""
+
+from __future__ import annotations
+
+import threading
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from sqlalchemy import MetaData, Table, desc, inspect, select
+from sqlalchemy.engine import Connection, Engine, Row
+
+from app.core.metrics import LOG_BUFFER_READS
+from app.database.log_buffer import LogBuffer, LogRecord
+from app.models.calculation_model import PARTITION_PREFIX, log_table
+
+INTERVALS = {"day": 1, "week": 7}
+# Single log table used before partitioning; migrated by `load()`
+LEGACY_TABLE = "requests"
+# Rows copied per INSERT while migrating the legacy table
+MIGRATE_BATCH = 1000
+
+
+def _utc_naive(ts: datetime) -> datetime:
+    """Timestamps are stored as naive UTC datetimes."""
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+class LogPartitions:
+    """Manages the set of per-period log tables on one engine."""
+
+    def __init__(self, engine: Engine, interval: str = "day",
+                 retention_days: int = 30,
+                 buffer: Optional[LogBuffer] = None,
+                 read_engine: Optional[Engine] = None) -> None:
+        if interval not in INTERVALS:
+            raise ValueError(f"interval must be one of {sorted(INTERVALS)}")
+        self.engine = engine
+        self.read_engine = read_engine or engine
+        self.buffer = buffer
+        self.period = timedelta(days=INTERVALS[interval])
+        self.weekly = interval == "week"
+        self.retention = timedelta(days=retention_days) \
+            if retention_days > 0 else None
+        self.metadata = MetaData()
+        self._tables: Dict[date, Table] = {}
+        self._current: Optional[Tuple[datetime, datetime, Table]] = None
+        self._lock = threading.Lock()
+
+    # Naming
+    def period_start(self, ts: datetime) -> date:
+        """First day of the period containing `ts`."""
+        day = _utc_naive(ts).date()
+        if self.weekly:
+            day -= timedelta(days=day.weekday())
+        return day
+
+    @staticmethod
+    def table_name(start: date) -> str:
+        return f"{PARTITION_PREFIX}{start:%Y%m%d}"
+
+    # Lifecycle
+    def load(self) -> None:
+        """
+        Discover existing partitions, migrate the legacy `requests`
+        table, switch SQLite to WAL and incremental auto-vacuum, apply
+        retention and fill the buffer. Call once at startup.
+        """
+        if self.engine.dialect.name == "sqlite":
+            self._configure_sqlite()
+        names = inspect(self.engine).get_table_names()
+        with self._lock:
+            for name in names:
+                start = self._parse_name(name)
+                if start is not None and start not in self._tables:
+                    self._tables[start] = log_table(name, self.metadata)
+            if LEGACY_TABLE in names:
+                self._migrate_legacy()
+        self.drop_expired()
+        if self.buffer is not None:
+            self._seed_buffer(self.buffer)
+
+    def _configure_sqlite(self) -> None:
+        # Existing files only switch mode after a full VACUUM (one-off),
+        # which cannot run inside a transaction.
+        with self.engine.connect().execution_options(
+                isolation_level="AUTOCOMMIT") as conn:
+            mode = conn.exec_driver_sql("PRAGMA auto_vacuum").scalar()
+            if mode != 2:
+                conn.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+                conn.exec_driver_sql("VACUUM")
+            # Persistent: readers see a snapshot and never block writers
+            conn.exec_driver_sql("PRAGMA journal_mode = WAL")
+
+    def _migrate_legacy(self) -> int:
+        """
+        Copy the rows of the legacy `requests` table into partitions
+        (skipping those already past the retention) and drop it, in one
+        transaction. Returns the number of rows moved.
+        """
+        legacy = log_table(LEGACY_TABLE, MetaData())
+        query = select(*[column for column in legacy.c
+                         if column.name != "id"]) \
+            .order_by(legacy.c.timestamp, legacy.c.id)
+        if self.retention is not None:
+            cutoff = _utc_naive(datetime.now(timezone.utc)) - self.retention
+            query = query.where(legacy.c.timestamp >= cutoff)
+        moved = 0
+        with self.engine.begin() as conn:
+            batch: List[Dict[str, Any]] = []
+            batch_start: Optional[date] = None
+            for row in conn.execute(query).mappings():
+                start = self.period_start(row["timestamp"])
+                if batch and (start != batch_start
+                              or len(batch) >= MIGRATE_BATCH):
+                    moved += self._copy_rows(conn, batch_start, batch)
+                    batch = []
+                batch_start = start
+                batch.append(dict(row))
+            if batch:
+                moved += self._copy_rows(conn, batch_start, batch)
+            legacy.drop(conn)
+        return moved
+
+    def _copy_rows(self, conn: Connection, start: date,
+                   rows: List[Dict[str, Any]]) -> int:
+        table = self._tables.get(start)
+        if table is None:
+            table = log_table(self.table_name(start), self.metadata)
+            table.create(conn, checkfirst=True)
+            self._tables[start] = table
+        conn.execute(table.insert(), rows)
+        return len(rows)
+
+    def _seed_buffer(self, buffer: LogBuffer) -> None:
+        """Load the newest rows so the buffer starts out useful."""
+        since = None
+        if buffer.max_age is not None:
+            since = _utc_naive(datetime.now(timezone.utc)) - buffer.max_age
+        rows = self._read(buffer.capacity, since=since)
+        if len(rows) >= buffer.capacity:
+            horizon = rows[-1].timestamp
+        else:
+            horizon = since
+        buffer.seed(rows, horizon)
+
+    @staticmethod
+    def _parse_name(name: str) -> Optional[date]:
+        if not name.startswith(PARTITION_PREFIX):
+            return None
+        try:
+            return datetime.strptime(name[len(PARTITION_PREFIX):],
+                                     "%Y%m%d").date()
+        except ValueError:
+            return None
+
+    def table_for(self, ts: datetime) -> Table:
+        """Partition for `ts`, created on first use."""
+        ts = _utc_naive(ts)
+        current = self._current
+        if current is not None and current[0] <= ts < current[1]:
+            return current[2]
+
+        start = self.period_start(ts)
+        created = False
+        with self._lock:
+            table = self._tables.get(start)
+            if table is None:
+                table = log_table(self.table_name(start), self.metadata)
+                table.create(self.engine, checkfirst=True)
+                self._tables[start] = table
+                created = True
+            begin = datetime.combine(start, datetime.min.time())
+            if current is None or begin >= current[0]:
+                self._current = (begin, begin + self.period, table)
+        if created:
+            # A new period started: a good moment to expire old ones
+            self.drop_expired(now=ts)
+        return table
+
+    def drop_expired(self, now: Optional[datetime] = None) -> List[str]:
+        """Drop partitions whose whole period is past the retention."""
+        if self.retention is None:
+            return []
+        now = _utc_naive(now or datetime.now(timezone.utc))
+        cutoff = now - self.retention
+        with self._lock:
+            expired = [
+                start for start in self._tables
+                if datetime.combine(start, datetime.min.time())
+                + self.period <= cutoff
+            ]
+            tables = [self._tables.pop(start) for start in expired]
+        for table in tables:
+            table.drop(self.engine, checkfirst=True)
+            self.metadata.remove(table)
+        if tables:
+            if self.buffer is not None:
+                newest = max(expired)
+                self.buffer.discard_before(
+                    datetime.combine(newest, datetime.min.time())
+                    + self.period)
+            self.vacuum()
+        return [table.name for table in tables]
+
+    # Reads and writes
+    def insert(self, row: Dict[str, Any]) -> None:
+        """Append one log row to the partition of its timestamp."""
+        table = self.table_for(row["timestamp"])
+        row = {**row, "timestamp": _utc_naive(row["timestamp"])}
+        with self.engine.begin() as conn:
+            conn.execute(table.insert(), row)
+        if self.buffer is not None:
+            self.buffer.append(row)
+
+    def partitions(self, since: Optional[datetime] = None,
+                   until: Optional[datetime] = None) -> List[Table]:
+        """Partitions overlapping [since, until], newest first."""
+        since = _utc_naive(since) if since else None
+        until = _utc_naive(until) if until else None
+        with self._lock:
+            items = sorted(self._tables.items(), reverse=True)
+        touched = []
+        for start, table in items:
+            begin = datetime.combine(start, datetime.min.time())
+            if until is not None and begin > until:
+                continue
+            if since is not None and begin + self.period <= since:
+                break
+            touched.append(table)
+        return touched
+
+    def recent(self, limit: int, operation: Optional[str] = None,
+               status: Optional[str] = None,
+               since: Optional[datetime] = None,
+               until: Optional[datetime] = None
+               ) -> List[Union[Row, LogRecord]]:
+        """
+        Most recent rows matching the filters, newest first; served
+        from the buffer when it holds the complete answer.
+        """
+        since = _utc_naive(since) if since else None
+        until = _utc_naive(until) if until else None
+        if self.buffer is not None and limit > 0:
+            records = self.buffer.query(limit, operation, status,
+                                        since, until)
+            if records is not None:
+                LOG_BUFFER_READS.inc(("hit",))
+                return list(records)
+            LOG_BUFFER_READS.inc(("miss",))
+        return self._read(limit, operation, status, since, until)
+
+    def _read(self, limit: int, operation: Optional[str] = None,
+              status: Optional[str] = None,
+              since: Optional[datetime] = None,
+              until: Optional[datetime] = None) -> List[Row]:
+        """`recent` straight from the partitions (read connection)."""
+        rows: List[Row] = []
+        tables = self.partitions(since, until)
+        if not tables or limit <= 0:
+            return rows
+        with self.read_engine.connect() as conn:
+            for table in tables:
+                query = select(table).order_by(desc(table.c.timestamp),
+                                               desc(table.c.id))
+                if operation:
+                    query = query.where(table.c.operation == operation)
+                if status:
+                    query = query.where(table.c.status == status)
+                if since:
+                    query = query.where(table.c.timestamp >= since)
+                if until:
+                    query = query.where(table.c.timestamp <= until)
+                rows.extend(conn.execute(query.limit(limit - len(rows))))
+                if len(rows) >= limit:
+                    break
+        return rows
+
+    def vacuum(self) -> None:
+        """Return free pages to the OS (SQLite only)."""
+        if self.engine.dialect.name == "sqlite":
+            with self.engine.begin() as conn:
+                conn.exec_driver_sql("PRAGMA incremental_vacuum")
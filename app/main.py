@@ -1,22 +1,21 @@
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI
 from fastapi.openapi.models import SecuritySchemeType, APIKeyIn
 from fastapi.openapi.utils import get_openapi
 from fastapi.responses import PlainTextResponse
 
-from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
-from prometheus_fastapi_instrumentator import Instrumentator
+from prometheus_client import CONTENT_TYPE_LATEST
 
-from app.controllers import (
-    factorial_controller,
-    fibonacci_controller,
-    power_controller,
-    log_controller,
-)
+from app.controllers import job_controller, log_controller
+from app.controllers.operation_controller import build_router
 from app.database.db_connection import init_db
 from app.core.app_config import DEBUG
-from app.core.api_security import verify_api_key
+from app.core.api_security import APIKeyMiddleware, PUBLIC_PATHS
+from app.core.compression import CompressionMiddleware
+from app.core.metrics import MetricsMiddleware, exposition
+from app.services.job_service import job_manager
+from app.services.operation_registry import OPERATIONS
 
 
 # Lifespan handler
@@ -24,13 +23,15 @@ from app.core.api_security import verify_api_key
 async def lifespan(_app: FastAPI):
     init_db()  # Run DB setup at startup
     yield      # Control returns to FastAPI while app is running
+    job_manager.shutdown()  # Stop background job workers
 
 
 # FastAPI app instance with custom metadata and lifespan
 app = FastAPI(
     title="Math Operations Microservice",
     description="A minimal FastAPI-based microservice exposing factorial, "
-                "Fibonacci, and power operations via API. "
+                "Fibonacci, power, binomial, modular power and gcd "
+                "operations via API. "
                 "Requests are logged with SQLite.",
     version="1.0.0",
     debug=DEBUG,
@@ -38,22 +39,27 @@ app = FastAPI(
 )
 
 
-# Instrumentation for Prometheus metrics
-instrum_prom = Instrumentator().instrument(app)
+# Negotiated gzip/brotli compression of large responses (innermost)
+app.add_middleware(CompressionMiddleware)
+# API-key check for every non-public route, ahead of routing
+app.add_middleware(APIKeyMiddleware)
+# Request count/latency per route template (outermost, so rejected
+# requests are counted too)
+app.add_middleware(MetricsMiddleware)
 
 
 # Register Prometheus metrics endpoint
 @app.get("/metrics",
          tags=["Metrics"],
          response_class=PlainTextResponse,
-         include_in_schema=True,
-         dependencies=[Depends(verify_api_key)])
+         include_in_schema=True)
 # Endpoint to expose Prometheus metrics
 def metrics():
-    # This endpoint returns the latest metrics in Prometheus format.
-    # It is protected by the API key dependency.
+    # This endpoint returns the latest metrics in Prometheus format,
+    # rendered at most once per METRICS_CACHE_SECONDS.
+    # It is protected by the API key middleware.
     return PlainTextResponse(
-        generate_latest(instrum_prom.registry),
+        exposition.render(),
         media_type=CONTENT_TYPE_LATEST
     )
 
@@ -87,11 +93,12 @@ def custom_openapi():
         }
     }
 
-    # 2. Apply it globally so every route shows the lock icon
-    for path in openapi_schema["paths"].values():
+    # 2. Apply it globally so every protected route shows the lock icon
+    for route, path in openapi_schema["paths"].items():
+        if route in PUBLIC_PATHS:
+            continue
         for operation in path.values():
-            if "security" in operation:
-                operation["security"] = [{"MathAPIKey": []}]
+            operation["security"] = [{"MathAPIKey": []}]
 
     app.openapi_schema = openapi_schema
     return app.openapi_schema
@@ -103,22 +110,16 @@ def root():
     return {"status": "ok"}
 
 
-# Route registrations with API key dependency
+# Route registrations (authenticated by APIKeyMiddleware)
 app.include_router(log_controller.router,
-                   prefix="/logs",
-                   dependencies=[Depends(verify_api_key)])
-app.include_router(factorial_controller.router,
-                   prefix="/factorial",
-                   tags=["Math"],
-                   dependencies=[Depends(verify_api_key)])
-app.include_router(fibonacci_controller.router,
-                   prefix="/fibonacci",
-                   tags=["Math"],
-                   dependencies=[Depends(verify_api_key)])
-app.include_router(power_controller.router,
-                   prefix="/power",
-                   tags=["Math"],
-                   dependencies=[Depends(verify_api_key)])
+                   prefix="/logs")
+app.include_router(job_controller.router,
+                   prefix="/jobs")
+# One generated router per registered math operation
+for _operation in OPERATIONS.values():
+    app.include_router(build_router(_operation),
+                       prefix=f"/{_operation.name}",
+                       tags=["Math"])
 
 # Tell FastAPI to use this custom generator
 app.openapi = custom_openapi
@@ -1,48 +1,40 @@
 """
-SQLAlchemy ORM model for persisting every API request.
+SQLAlchemy table definition for persisting every API request.
 
-Table name: requests
-Columns:
+Requests are stored in time partitions (see app.database.log_partitions):
+one table per day or week, named requests_YYYYMMDD after the first day it
+covers. Every partition shares the same columns:
     id          – Primary key, auto-increment
     operation   – Name of the math operation (factorial, fibonacci, power)
     input       – JSON payload received from the client
     result      – Numeric result of the operation (stored as FLOAT)
     timestamp   – UTC datetime when the request was processed
+    status      – 'success' or 'error'
+    message     – Optional error / info message
 """
-from datetime import datetime, timezone
-
-from sqlalchemy import Column, DateTime, Float, Integer, String
+from sqlalchemy import (Column, DateTime, Float, Index, Integer, MetaData,
+                        String, Table)
 from sqlalchemy.types import JSON
 
-from app.database.db_connection import Base
-
+# Prefix shared by every log partition table
+PARTITION_PREFIX = "requests_"
 
-class Request(Base):
-    """ORM model representing a single logged API request."""
-    __tablename__ = "requests"
 
-    id: int = Column(Integer, primary_key=True, autoincrement=True, index=True)
-    operation: str = Column(String, nullable=False, index=True)
-    # Uses SQLite JSON extension
-    input: dict = Column(JSON, nullable=False)
-    result: float = Column(Float, nullable=True)
-    # Stores factorial/Fibonacci/power result
-    timestamp: datetime = Column(
-        DateTime, nullable=False, default=datetime.now(timezone.utc)
+def log_table(name: str, metadata: MetaData) -> Table:
+    """Build the Table object for one log partition."""
+    return Table(
+        name,
+        metadata,
+        Column("id", Integer, primary_key=True, autoincrement=True),
+        Column("operation", String, nullable=False),
+        # Uses SQLite JSON extension
+        Column("input", JSON, nullable=False),
+        # Stores factorial/Fibonacci/power result
+        Column("result", Float, nullable=True),
+        Column("timestamp", DateTime, nullable=False),
+        Column("status", String, nullable=False),
+        Column("message", String, nullable=True),
+        # Index names are global in SQLite, so they carry the table name
+        Index(f"ix_{name}_operation", "operation"),
+        Index(f"ix_{name}_timestamp", "timestamp"),
     )
-    # Stores the status of the request (e.g., 'success', 'error')
-    status: str = Column(String, nullable=False)
-    # Optional message for errors or additional info
-    message: str = Column(String, nullable=True)
-
-    # Optional, but useful when inspecting objects in logs / debugger
-    def __repr__(self) -> str:  # pragma: no cover
-        # Shorten message for failed calls to keep repr manageable
-        msg = (self.message[:40] + "…") \
-            if self.message and len(self.message) > 43 \
-            else self.message
-        return (
-            f"<Request(id={self.id}, op={self.operation}, "
-            f"input={self.input}, result={self.result}, ts={self.timestamp}, "
-            f"status={self.status}, message={msg})>"
-        )
@@ -5,41 +5,128 @@ Each request type has its own schema, and we return a common response schema
 """
 
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Generic, List, Literal, Optional, TypeVar, Union
 from pydantic import BaseModel, Field, ConfigDict
 
+# Upper bound on items accepted by any /<operation>/batch endpoint
+MAX_BATCH_ITEMS = 10_000
+# ... and by a background batch job (POST /jobs)
+MAX_JOB_ITEMS = 1_000_000
+MAX_GCD_VALUES = 10_000
+
+# Result precision for factorial / Fibonacci / power:
+#   exact  – the value itself (default)
+#   log10  – log10(|value|) as a float
+#   approx – {"mantissa", "exponent"} for values beyond float range
+Precision = Literal["exact", "log10", "approx"]
+
 
 # 1. Request schemas
 class FactorialRequest(BaseModel):
     """Payload for /factorial – non-negative integer n."""
     n: int = Field(..., description="Non-negative integer")
+    precision: Precision = Field(
+        "exact", description="'exact' (n ≤ 170), 'log10' or 'approx' "
+                             "(n ≤ 10¹⁰)"
+    )
 
 
 class FibonacciRequest(BaseModel):
     """Payload for /fibonacci – non-negative integer n."""
     n: int = Field(..., description="Non-negative integer")
+    precision: Precision = Field(
+        "exact", description="'exact' (n ≤ 1,476), 'log10' or 'approx' "
+                             "(n ≤ 10¹⁰)"
+    )
 
 
 class PowerRequest(BaseModel):
-    """Payload for /power – float/int base and float/int exponent."""
-    base: float = Field(..., description="Base number (float or int)")
-    exponent: float = Field(..., description="Exponent (float or int)")
+    """
+    Payload for /power – float/int base and float/int exponent.
+    mode="int" computes the exact integer result (optionally mod
+    `modulus`) and returns it as a decimal string.
+    """
+    base: Union[int, float] = Field(...,
+                                    description="Base number (float or int)")
+    exponent: Union[int, float] = Field(...,
+                                        description="Exponent (float or int)")
+    mode: Literal["float", "int"] = Field(
+        "float", description="'float' (64-bit) or 'int' (exact integer)"
+    )
+    modulus: Optional[int] = Field(
+        None, description="Optional modulus for mode='int'"
+    )
+    precision: Precision = Field(
+        "exact", description="'exact', 'log10' or 'approx' (mode='float')"
+    )
+
+
+class BinomialRequest(BaseModel):
+    """Payload for /binomial – choose k items out of n."""
+    n: int = Field(..., description="Non-negative integer (n ≤ 1,000)")
+    k: int = Field(..., description="Non-negative integer (k ≤ n)")
+
+
+class ModPowRequest(BaseModel):
+    """Payload for /modpow – integer base, exponent and modulus."""
+    base: int = Field(..., description="Integer base (may be negative)")
+    exponent: int = Field(..., description="Non-negative integer exponent")
+    modulus: int = Field(..., description="Modulus (1 ≤ modulus ≤ 2⁵³)")
+
+
+class GcdRequest(BaseModel):
+    """Payload for /gcd – array of integers."""
+    values: List[int] = Field(..., min_length=1, max_length=MAX_GCD_VALUES,
+                              description="Integers to take the gcd of")
+
+
+RequestT = TypeVar("RequestT", bound=BaseModel)
+
+
+class BatchRequest(BaseModel, Generic[RequestT]):
+    """Payload for /<operation>/batch – a list of single-call payloads."""
+    items: List[RequestT] = Field(..., min_length=1,
+                                  max_length=MAX_BATCH_ITEMS)
+
+
+class JobRequest(BaseModel):
+    """
+    Payload for POST /jobs – run one operation in the background, either
+    on a single `input` or on a list of `items` (batch).
+    """
+    operation: str = Field(..., description="Registered operation name, "
+                                            "e.g. 'factorial' or 'power'")
+    input: Optional[Dict[str, Any]] = Field(
+        None, description="Single-call payload, as for POST /<operation>"
+    )
+    items: Optional[List[Dict[str, Any]]] = Field(
+        None, max_length=MAX_JOB_ITEMS,
+        description="Batch payloads, as for POST /<operation>/batch"
+    )
+
+
+# 2. Response schemas
+class ApproxResult(BaseModel):
+    """Approximate value: mantissa × 10^exponent (1 ≤ |mantissa| < 10)."""
+    mantissa: float
+    exponent: int
 
 
-# 2. Response schema
 class CalculationResponse(BaseModel):
     """
     Standard API response:
       • operation  – 'factorial', 'fibonacci', or 'power'
       • input      – original request payload as a dict
-      • result     – numeric result (stored as FLOAT in DB)
+      • result     – numeric result (stored as FLOAT in DB); exact
+                     integer results are returned as decimal strings
+                     and precision="approx" as {mantissa, exponent}
       • timestamp  – UTC time when the calculation was processed
       • status     – "success" or "error"
       • message    – error explanation if status = "error"
     """
     operation: str
     input: Dict[str, Any]
-    result: Optional[float] = None
+    result: Optional[Union[float, str, ApproxResult]] = None
     timestamp: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc)
     )
@@ -49,3 +136,38 @@ class CalculationResponse(BaseModel):
     # Enables conversion from SQLAlchemy model instances
     # to Pydantic models when returning from endpoints
     model_config = ConfigDict(from_attributes=True)
+
+
+class BatchResponse(BaseModel):
+    """
+    Response for /<operation>/batch:
+      • results – one numeric result per item, in request order
+    """
+    operation: str
+    input: Dict[str, Any]
+    results: List[Union[float, str, ApproxResult]]
+    timestamp: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc)
+    )
+    status: str = "success"
+    message: Optional[str] = None
+
+
+class JobStatus(BaseModel):
+    """
+    State of a background job:
+      • status       – 'queued', 'running', 'done' or 'error'
+      • result_size  – size in bytes of the stored JSON result
+      • message      – error explanation if status = "error"
+    """
+    id: str
+    operation: str
+    status: str
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    runtime_seconds: Optional[float] = None
+    result_size: Optional[int] = None
+    message: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,266 @@
+"""
+Background jobs for calculations too long for one HTTP request.
+
+POST /jobs hands the work to a local process pool and returns at once.
+Each worker runs the registered `Operation` kernels and streams the
+formatted result straight to a file in JOB_RESULT_DIR, so large outputs
+never travel back through the pool or sit in the server's memory; the
+download endpoint memory-maps that file.
+
+Jobs get JOB_COST_FACTOR times the cost budget of a synchronous call and
+run the job variant of each operation (`Operation.for_jobs`): factorial
+and Fibonacci accept far larger n there and return exact decimal strings.
+Job metadata is kept in memory (the newest JOB_HISTORY jobs), so result
+files left over from an earlier run are deleted when the pool starts;
+finishing a job logs one '<operation>.job' record and updates the Prometheus
+metrics below.
+"""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from prometheus_client import Counter, Gauge, Histogram
+
+from app.core.app_config import (JOB_COST_FACTOR, JOB_HISTORY,
+                                 JOB_RESULT_DIR, JOB_WORKERS)
+from app.services.math_service import run_logged
+from app.services.operation_registry import OPERATIONS, get_operation
+
+# Results are written in slices of this many items
+_WRITE_CHUNK = 10_000
+
+# Metrics
+JOBS_IN_QUEUE = Gauge("math_jobs_queue_depth",
+                      "Jobs submitted and not finished yet")
+JOBS_FINISHED = Counter("math_jobs_total", "Finished jobs",
+                        ["operation", "status"])
+JOB_RUNTIME = Histogram("math_job_runtime_seconds",
+                        "Time a worker spent on one job", ["operation"],
+                        buckets=(0.01, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 300))
+
+
+def _execute(operation: str, payload: Optional[Dict[str, Any]],
+             items: Optional[List[Dict[str, Any]]], path: str,
+             max_cost: int) -> Dict[str, float]:
+    """
+    Worker-process entry point: compute and write the result file.
+    Returns wall-clock start/end times and the file size.
+    """
+    started = time.time()
+    op = get_operation(operation).for_jobs()
+    try:
+        if items is None:
+            results = [op.compute(payload or {}, max_cost)]
+        else:
+            payloads = [op.request_model.model_validate(item)
+                        .model_dump(exclude_defaults=True)
+                        for item in items]
+            results = op.compute_batch(payloads, max_cost)
+    except ValueError as e:
+        # Plain ValueError: pydantic errors do not pickle back reliably
+        raise ValueError(str(e)) from None
+
+    partial = path + ".part"
+    with open(partial, "w", encoding="utf-8") as handle:
+        handle.write(f'{{"operation": {json.dumps(operation)}, ')
+        if items is None:
+            handle.write('"result": ')
+            handle.write(json.dumps(op.format_result(results[0])))
+        else:
+            handle.write('"results": [')
+            for start in range(0, len(results), _WRITE_CHUNK):
+                chunk = [op.format_result(value)
+                         for value in results[start:start + _WRITE_CHUNK]]
+                if start:
+                    handle.write(", ")
+                handle.write(json.dumps(chunk)[1:-1])
+            handle.write("]")
+        handle.write("}")
+    os.replace(partial, path)
+    return {"started": started, "finished": time.time(),
+            "size": os.path.getsize(path)}
+
+
+def _utc(ts: float) -> datetime:
+    return datetime.fromtimestamp(ts, timezone.utc)
+
+
+@dataclass
+class Job:
+    """Book-keeping for one submitted job (lives in the API process)."""
+    id: str
+    operation: str
+    input: Dict[str, Any]
+    path: str
+    created_at: datetime = field(
+        default_factory=lambda: datetime.now(timezone.utc)
+    )
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result_size: Optional[int] = None
+    message: Optional[str] = None
+    future: Optional[Future] = None
+    failed: bool = False
+
+    @property
+    def status(self) -> str:
+        if self.future is None or not self.future.done():
+            if self.future is not None and self.future.running():
+                return "running"
+            return "queued"
+        if self.finished_at is None:
+            return "running"  # done, callback still recording the outcome
+        return "error" if self.failed else "done"
+
+    @property
+    def runtime_seconds(self) -> Optional[float]:
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return (self.finished_at - self.started_at).total_seconds()
+
+
+def _is_job_id(name: str) -> bool:
+    """Names of result files are uuid4 hex ids."""
+    return len(name) == 32 and all(c in "0123456789abcdef" for c in name)
+
+
+class JobManager:
+    """Submits jobs to a process pool and tracks their results."""
+
+    def __init__(self, result_dir: str = JOB_RESULT_DIR,
+                 workers: int = JOB_WORKERS, history: int = JOB_HISTORY,
+                 cost_factor: int = JOB_COST_FACTOR) -> None:
+        self.result_dir = result_dir
+        self.workers = workers
+        self.history = history
+        self.cost_factor = cost_factor
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                os.makedirs(self.result_dir, exist_ok=True)
+                self._remove_stale_results()
+                # Never fork the threaded server: a lock held by another
+                # thread at fork time would stay locked in the worker
+                self._executor = ProcessPoolExecutor(
+                    self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _remove_stale_results(self) -> None:
+        """
+        Delete result files no job here knows about: job metadata lives
+        in memory, so files left by an earlier run are unreachable.
+        """
+        for entry in os.scandir(self.result_dir):
+            job_id, _, ext = entry.name.partition(".")
+            if ext in ("json", "json.part") and _is_job_id(job_id) \
+                    and job_id not in self._jobs and entry.is_file():
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+    def submit(self, operation: str,
+               payload: Optional[Dict[str, Any]] = None,
+               items: Optional[List[Dict[str, Any]]] = None) -> Job:
+        """
+        Queue a single calculation (`payload`) or a batch (`items`).
+        Single payloads are validated up front (pydantic ValidationError
+        for schema errors, ValueError for bounds and cost); batch items
+        are validated by the worker and reported as a job error.
+        """
+        if operation not in OPERATIONS:
+            raise ValueError(f"Unknown operation {operation!r}")
+        if (payload is None) == (items is None):
+            raise ValueError("Provide exactly one of 'input' or 'items'")
+        op = get_operation(operation).for_jobs()
+        max_cost = op.max_cost * self.cost_factor
+        if payload is not None:
+            payload = op.request_model.model_validate(payload) \
+                .model_dump(exclude_defaults=True)
+            op.validate(payload, max_cost)
+
+        job_id = uuid.uuid4().hex
+        job = Job(
+            id=job_id,
+            operation=operation,
+            input=payload if payload is not None else {"items": len(items)},
+            path=os.path.join(self.result_dir, f"{job_id}.json"),
+        )
+        with self._lock:
+            self._jobs[job_id] = job
+        JOBS_IN_QUEUE.inc()
+        job.future = self._pool().submit(_execute, operation, payload, items,
+                                         job.path, max_cost)
+        job.future.add_done_callback(lambda _: self._finish(job))
+        self._evict()
+        return job
+
+    def _finish(self, job: Job) -> None:
+        """Record the outcome and log the job as one request record."""
+        assert job.future is not None
+        try:
+            outcome = run_logged(f"{job.operation}.job", job.input,
+                                 job.future.result,
+                                 "Job completed successfully")
+            job.started_at = _utc(outcome["started"])
+            job.result_size = int(outcome["size"])
+            job.message = "Job completed successfully"
+            job.finished_at = _utc(outcome["finished"])
+            JOB_RUNTIME.labels(job.operation).observe(job.runtime_seconds)
+        except Exception as e:  # job errors and broken/cancelled pools
+            job.failed = True
+            job.message = str(e) or e.__class__.__name__
+            job.finished_at = datetime.now(timezone.utc)
+        JOBS_IN_QUEUE.dec()
+        JOBS_FINISHED.labels(job.operation, job.status).inc()
+
+    def _evict(self) -> None:
+        """Forget the oldest finished jobs beyond `history`."""
+        with self._lock:
+            excess = len(self._jobs) - self.history
+            for job_id in list(self._jobs):
+                if excess <= 0:
+                    break
+                job = self._jobs[job_id]
+                if job.finished_at is None:
+                    continue
+                del self._jobs[job_id]
+                excess -= 1
+                try:
+                    os.remove(job.path)
+                except OSError:
+                    pass
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def queue_depth(self) -> int:
+        return sum(1 for job in list(self._jobs.values())
+                   if job.finished_at is None)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Process-wide job manager
+job_manager = JobManager()
@@ -1,6 +1,9 @@
 """
 Business-logic layer that provides
-  • cached math helpers  (factorial, fibonacci, power)
+  • cached math helpers  (factorial, fibonacci, power, binomial,
+    modular exponentiation, gcd)
+  • batch helpers that answer many inputs in a single pass
+  • sequence generators that yield consecutive terms incrementally
   • automatic logging of every call (success OR failure)
 in the local SQLite database.
 
@@ -11,25 +14,52 @@ Design choices
 * Input guards:
 * n must be 0 … 170 (factorial).
 * n must be 0 … 1,476 (Fibonacci).
+  Background jobs pass a higher `limit` (100,000 / 1,000,000).
 * power() accepts floats for `base` and floats for `exponent`
   (negative exponents are allowed).
+* power(mode="int") works on exact integers, optionally modulo `modulus`,
+  and is limited by an estimated cost instead of the float range.
+* precision="log10" / "approx" answer factorial, Fibonacci and power in
+  O(1) from logarithms (lgamma, Binet's formula, exponent * log10(base)),
+  for n up to 10**10; approx returns (mantissa, exponent) with only the
+  digits the float logarithm can vouch for.
+* binomial() requires 0 <= k <= n <= 1,000 (result fits a float).
+* modpow() requires exponent >= 0 and 1 <= modulus <= 2**53
+  (result is exactly representable as a float).
 """
 
 from __future__ import annotations
 
+import time
 from datetime import datetime, timezone
 from functools import lru_cache
-from math import factorial as _py_factorial, isfinite, log10
-from typing import Any, Dict, Optional
+from math import (comb, factorial as _py_factorial, floor, gcd, isfinite,
+                  lgamma, log, log2, log10, sqrt)
+from typing import (Any, Callable, Dict, Iterator, List, NamedTuple,
+                    Optional, Sequence, Tuple, Union)
 
-from sqlalchemy.orm import Session
-
-from app.database.db_connection import SessionLocal
-from app.models.calculation_model import Request
+from app.core.metrics import LOG_WRITE_SECONDS, register_cached_kernel
+from app.database.db_connection import log_partitions
 
 # Constants
 MAX_FACTORIAL_N = 170
 MAX_FIBONACCI_N = 1_476
+# Ceilings for exact factorial/Fibonacci in background jobs
+MAX_JOB_FACTORIAL_N = 100_000
+MAX_JOB_FIBONACCI_N = 1_000_000
+MAX_BINOMIAL_N = 1_000
+MAX_MODPOW_MODULUS = 2 ** 53
+# Budget for integer power, in 64-bit limb multiplications (≈ 2-3 s)
+MAX_POWER_COST = 250_000_000
+# Largest int CPython's str() converts under the default digit limit
+_STR_SAFE_BITS = 13_000
+# Ceiling on n for the log10/approx precision modes
+MAX_LOG_N = 10 ** 10
+_LN10 = log(10)
+_LOG10_PHI = log10((1 + sqrt(5)) / 2)
+_LOG10_SQRT5 = log10(sqrt(5))
+# Relative error assumed for a float logarithm (a few ulps)
+_LOG_REL_ERROR = 2.0 ** -50
 
 
 # Helpers: Logging
@@ -41,26 +71,19 @@ def _log_request(
         message: Optional[str] = None
 ) -> None:
     """
-    Insert a row in the `requests` table.
-    Opens and closes its own SQLAlchemy session per call.
+    Insert a row in the current request-log partition.
+    Runs in its own short transaction per call.
     """
-    db: Session = SessionLocal()
-    try:
-        entry = Request(
-            operation=operation,
-            input=payload,
-            result=result,  # Result may be None on failure
-            timestamp=datetime.now(timezone.utc),
-            status=status,
-            message=message
-        )
-        db.add(entry)
-        db.commit()
-    except Exception:
-        db.rollback()
-        raise
-    finally:
-        db.close()
+    start = time.perf_counter()
+    log_partitions.insert({
+        "operation": operation,
+        "input": payload,
+        "result": result,  # Result may be None on failure
+        "timestamp": datetime.now(timezone.utc),
+        "status": status,
+        "message": message,
+    })
+    LOG_WRITE_SECONDS.observe(time.perf_counter() - start)
 
 
 # Cached math kernels (pure functions)
@@ -113,62 +136,364 @@ def _power_cached(base: float, exponent: float) -> float:
     return result
 
 
-# Public API called from controllers
-def calculate_factorial(n: int) -> int:
-    """Compute factorial(n) and log the call."""
-    result: Optional[int] = None
+@lru_cache(maxsize=128)
+def _power_int_cached(base: int, exponent: int,
+                      modulus: Optional[int]) -> int:
+    """
+    Exact integer power with cache.
+    Both branches use CPython's square-and-multiply exponentiation;
+    the modular one never materialises base ** exponent.
+    """
+    if modulus is not None:
+        if modulus == 0:
+            raise ValueError("modulus must be non-zero")
+        # Negative exponents need base to be invertible mod modulus;
+        # pow() raises ValueError otherwise.
+        return pow(base, exponent, modulus)
+    if exponent < 0:
+        raise ValueError("exponent must be non-negative in int mode "
+                         "(or pass a modulus)")
+    return base ** exponent
+
+
+def _as_int(name: str, value: Union[int, float]) -> int:
+    """Accept ints and integral floats for int mode."""
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError(f"{name} must be an integer in int mode")
+        return int(value)
+    return value
+
+
+def _limbs(bits: int) -> int:
+    """Number of 64-bit limbs needed for a `bits`-bit integer."""
+    return max(1, -(-bits // 64))
+
+
+def power_cost(base: Union[int, float], exponent: Union[int, float],
+               mode: str = "float", modulus: Optional[int] = None,
+               precision: str = "exact") -> int:
+    """
+    Estimated work for power(), in 64-bit limb multiplications.
+      • float mode         – constant (any precision)
+      • int mode + modulus – one squaring per exponent bit
+      • int mode           – dominated by the size of the result
+                             (multiplying and printing it)
+    """
+    if mode != "int":
+        return 1
+    exponent_bits = abs(int(exponent)).bit_length()
+    if modulus is not None:
+        return exponent_bits * _limbs(abs(modulus).bit_length()) ** 2
+    magnitude = abs(int(base))
+    # exponent * log2(base) in fixed point: the exponent may be far too
+    # large to convert to a float
+    result_bits = (abs(int(exponent)) * int(log2(magnitude) * 2 ** 20)) \
+        >> 20 if magnitude > 1 else 0
+    return _limbs(result_bits) ** 2 + exponent_bits
+
+
+def power(base: Union[int, float], exponent: Union[int, float],
+          mode: str = "float", modulus: Optional[int] = None,
+          precision: str = "exact") -> Union[int, float, Approx]:
+    """
+    Dispatch between the float kernel (default), exact integer power and
+    the log-domain precision modes.
+    """
+    if mode == "int":
+        if precision != "exact":
+            raise ValueError("precision modes require mode='float'")
+        return _power_int_cached(_as_int("base", base),
+                                 _as_int("exponent", exponent),
+                                 modulus)
+    if modulus is not None:
+        raise ValueError("modulus is only supported with mode='int'")
     try:
-        result = _factorial_cached(n)
-        _log_request("factorial",
-                     {"n": n},
-                     float(result),
-                     "success",
-                     "Factorial calculated successfully")
-        return result
-    except ValueError as e:
-        _log_request("factorial",
-                     {"n": n},
-                     None,
-                     "error",
-                     str(e))
-        raise
+        base, exponent = float(base), float(exponent)
+    except OverflowError:
+        raise ValueError("Input exceeds 64‑bit float range; "
+                         "try mode='int'") from None
+    if precision == "exact":
+        return _power_cached(base, exponent)
+    log_value, negative = power_log10(base, exponent)
+    return _with_precision(log_value, precision, negative)
+
+
+# Log-domain kernels: O(1) answers for results far beyond float range
+class Approx(NamedTuple):
+    """value ≈ mantissa × 10**exponent, with 1 <= |mantissa| < 10."""
+    mantissa: float
+    exponent: int
+
+
+def to_approx(log_value: float, negative: bool = False) -> Approx:
+    """
+    Split log10(|value|) into mantissa/exponent, rounding the mantissa to
+    the significant digits that survive the float error of `log_value`.
+    """
+    exponent = floor(log_value)
+    error = max(abs(log_value), 1.0) * _LOG_REL_ERROR * _LN10
+    digits = max(1, min(15, floor(-log10(error))))
+    mantissa = round(10 ** (log_value - exponent), digits - 1)
+    if mantissa >= 10:
+        mantissa /= 10
+        exponent += 1
+    return Approx(-mantissa if negative else mantissa, exponent)
+
+
+def _with_precision(log_value: float, precision: str,
+                    negative: bool = False) -> Union[float, Approx]:
+    if precision == "log10":
+        return log_value
+    return to_approx(log_value, negative)
+
+
+def _check_log_n(n: int) -> None:
+    if n < 0:
+        raise ValueError("n must be non-negative (n >= 0)")
+    if n > MAX_LOG_N:
+        raise ValueError(f"n must not exceed {MAX_LOG_N}")
+
+
+@lru_cache(maxsize=128)
+def factorial_log10(n: int) -> float:
+    """log10(n!): exact below the float ceiling, lgamma(n + 1) above."""
+    _check_log_n(n)
+    if n <= MAX_FACTORIAL_N:
+        return log10(_factorial_cached(n))
+    return lgamma(n + 1) / _LN10
+
+
+@lru_cache(maxsize=128)
+def fibonacci_log10(n: int) -> float:
+    """
+    log10(F(n)): exact below the float ceiling, Binet's formula above
+    (F(n) = φⁿ/√5 rounded; the dropped term is below 10**-300 there).
+    """
+    _check_log_n(n)
+    if n == 0:
+        raise ValueError("log10 is undefined for F(0) = 0")
+    if n <= MAX_FIBONACCI_N:
+        return log10(_fibonacci_cached(n))
+    return n * _LOG10_PHI - _LOG10_SQRT5
+
+
+def power_log10(base: float, exponent: float) -> Tuple[float, bool]:
+    """log10(|base ** exponent|) and whether the result is negative."""
+    if base == 0:
+        raise ValueError("log10 is undefined for a zero or infinite result")
+    if base < 0 and not exponent.is_integer():
+        raise ValueError("Result is not a real number")
+    log_value = exponent * log10(abs(base))
+    if not isfinite(log_value):
+        raise ValueError("Result exponent exceeds 64‑bit float range")
+    negative = base < 0 and int(exponent) % 2 == 1
+    return log_value, negative
+
+
+def _check_exact_limit(n: int, limit: int) -> None:
+    if n > limit:
+        raise ValueError(f"n must not exceed {limit}")
+
+
+def _fibonacci_doubling(n: int) -> int:
+    """F(n) by fast doubling: O(log n) big-int multiplications."""
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        a, b = (d, c + d) if bit == "1" else (c, d)
+    return a
+
+
+def factorial(n: int, precision: str = "exact",
+              limit: int = MAX_FACTORIAL_N) -> Union[int, float, Approx]:
+    """
+    n! as an exact int, log10(n!) or an Approx.
+    `limit` raises the ceiling on exact n (background jobs).
+    """
+    if precision == "exact":
+        if n <= MAX_FACTORIAL_N:
+            return _factorial_cached(n)
+        _check_exact_limit(n, limit)
+        return _py_factorial(n)
+    return _with_precision(factorial_log10(n), precision)
+
+
+def fibonacci(n: int, precision: str = "exact",
+              limit: int = MAX_FIBONACCI_N) -> Union[int, float, Approx]:
+    """
+    F(n) as an exact int, log10(F(n)) or an Approx.
+    `limit` raises the ceiling on exact n (background jobs).
+    """
+    if precision == "exact":
+        if n <= MAX_FIBONACCI_N:
+            return _fibonacci_cached(n)
+        _check_exact_limit(n, limit)
+        return _fibonacci_doubling(n)
+    return _with_precision(fibonacci_log10(n), precision)
+
+
+@lru_cache(maxsize=256)
+def _pow10(k: int) -> int:
+    return 10 ** k
+
+
+def _decimal_digits(value: int) -> str:
+    """Recursive split so every str() call stays under the digit limit."""
+    if value.bit_length() <= _STR_SAFE_BITS:
+        return str(value)
+    half = int(value.bit_length() * 0.30103) // 2
+    high, low = divmod(value, _pow10(half))
+    return _decimal_digits(high) + _decimal_digits(low).zfill(half)
+
+
+@lru_cache(maxsize=32)
+def int_to_decimal(value: int) -> str:
+    """
+    Exact decimal string for arbitrarily large ints.
+    Works without lifting sys.int_max_str_digits process-wide.
+    """
+    if value < 0:
+        return "-" + _decimal_digits(-value)
+    return _decimal_digits(value)
+
+
+@lru_cache(maxsize=128)
+def _binomial_cached(n: int, k: int) -> int:
+    """Binomial coefficient C(n, k) via math.comb, with cache."""
+    if n < 0 or k < 0:
+        raise ValueError("n and k must be non-negative")
+    if k > n:
+        raise ValueError("k must not exceed n")
+    if n > MAX_BINOMIAL_N:
+        raise ValueError(f"n must not exceed {MAX_BINOMIAL_N}")
+    return comb(n, k)
+
+
+@lru_cache(maxsize=128)
+def _modpow_cached(base: int, exponent: int, modulus: int) -> int:
+    """Modular exponentiation (square-and-multiply) with cache."""
+    if exponent < 0:
+        raise ValueError("exponent must be non-negative (exponent >= 0)")
+    if not 1 <= modulus <= MAX_MODPOW_MODULUS:
+        raise ValueError(f"modulus must be between 1 and "
+                         f"{MAX_MODPOW_MODULUS}")
+    return pow(base, exponent, modulus)
+
+
+@lru_cache(maxsize=128)
+def _gcd_cached(values: Tuple[int, ...]) -> int:
+    """Greatest common divisor of a (hashable) tuple of integers."""
+    if not values:
+        raise ValueError("values must contain at least one integer")
+    return gcd(*values)
+
+
+# Export hit/miss counters of every cached kernel on /metrics
+for _kernel in (_factorial_cached, _fibonacci_cached, _power_cached,
+                _power_int_cached, factorial_log10, fibonacci_log10,
+                int_to_decimal, _binomial_cached, _modpow_cached,
+                _gcd_cached):
+    register_cached_kernel(_kernel.__name__.strip("_"), _kernel)
 
 
-def calculate_fibonacci(n: int) -> int:
-    """Compute fibonacci(n) and log the call."""
-    result: Optional[int] = None
+# Batch kernels: answer a whole list of inputs in one pass
+def factorial_batch(ns: Sequence[int],
+                    limit: int = MAX_FACTORIAL_N) -> List[int]:
+    """
+    Factorials for many n at once.
+    Walks 1..max(ns) a single time, so the cost is O(max n)
+    instead of O(sum n).
+    """
+    for n in ns:
+        if n < 0:
+            raise ValueError("n must be non-negative (n >= 0)")
+        _check_exact_limit(n, limit)
+    found: Dict[int, int] = {}
+    acc, k = 1, 1
+    for n in sorted(set(ns)):
+        while k < n:
+            k += 1
+            acc *= k
+        found[n] = acc
+    return [found[n] for n in ns]
+
+
+def fibonacci_batch(ns: Sequence[int],
+                    limit: int = MAX_FIBONACCI_N) -> List[int]:
+    """
+    Fibonacci numbers for many n at once, in a single O(max n) sweep.
+    """
+    for n in ns:
+        if n < 0:
+            raise ValueError("n must be non-negative (n >= 0)")
+        _check_exact_limit(n, limit)
+    found: Dict[int, int] = {}
+    a, b, k = 0, 1, 0
+    for n in sorted(set(ns)):
+        while k < n:
+            a, b = b, a + b
+            k += 1
+        found[n] = a
+    return [found[n] for n in ns]
+
+
+# Sequence generators: each term is one step away from the previous one,
+# so range(start, stop, step) costs O(stop) in total.
+def factorial_range(start: int, stop: int,
+                    step: int = 1) -> Iterator[Tuple[int, int]]:
+    """Yield (n, n!) for n in range(start, stop, step)."""
+    acc = 1
+    for n in range(stop):
+        if n:
+            acc *= n
+        if n >= start and (n - start) % step == 0:
+            yield n, acc
+
+
+def fibonacci_range(start: int, stop: int,
+                    step: int = 1) -> Iterator[Tuple[int, int]]:
+    """Yield (n, F(n)) for n in range(start, stop, step)."""
+    a, b = 0, 1
+    for n in range(stop):
+        if n >= start and (n - start) % step == 0:
+            yield n, a
+        a, b = b, a + b
+
+
+# Shared "compute + log" wrapper
+def run_logged(
+        operation: str,
+        payload: Dict[str, Any],
+        compute: Callable[[], Any],
+        message: str,
+) -> Any:
+    """
+    Run `compute()` and log the call as success or error.
+    ValueErrors are logged and re-raised for the caller to report.
+    """
     try:
-        result = _fibonacci_cached(n)
-        _log_request("fibonacci",
-                     {"n": n},
-                     float(result),
-                     "success",
-                     "Fibonacci calculated successfully")
-        return result
+        result = compute()
     except ValueError as e:
-        _log_request("fibonacci",
-                     {"n": n},
-                     None,
-                     "error",
-                     str(e))
+        _log_request(operation, payload, None, "error", str(e))
         raise
+    _log_request(operation, payload, log_value(result), "success", message)
+    return result
 
 
-def calculate_power(base: float, exponent: float) -> float:
-    """Compute base ** exponent and log the call."""
-    result: Optional[float] = None
+def log_cached(operation: str, payload: Dict[str, Any],
+               result: Optional[float], message: str) -> None:
+    """
+    Log a call answered from a response cache; `result` is the
+    `log_value` recorded when the response was computed.
+    """
+    _log_request(operation, payload, result, "success", message)
+
+
+def log_value(result: Any) -> Optional[float]:
+    """Float for the `result` column, or None if it does not fit."""
     try:
-        result = _power_cached(base, exponent)
-        _log_request("power",
-                     {"base": base, "exponent": exponent},
-                     result,
-                     "success",
-                     "Power calculated successfully")
-        return result
-    except ValueError as e:
-        _log_request("power",
-                     {"base": base, "exponent": exponent},
-                     None,
-                     "error",
-                     str(e))
-        raise
+        return float(result)
+    except (TypeError, OverflowError):
+        return None
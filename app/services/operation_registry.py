@@ -0,0 +1,357 @@
+"""
+Operation registry: one declarative entry per math operation.
+
+Each `Operation` bundles everything the HTTP layer needs to expose it:
+  • request schema         – Pydantic model for a single call
+  • validation bounds      – inclusive (min, max) per numeric field, with
+                             looser ones for the log10/approx precisions
+  • cost estimate          – rough work units, used to reject heavy calls
+  • result formatting      – JSON representation of a kernel result
+  • cache policy           – max-age advertised on the GET route
+  • kernel / batch kernel  – single-call and vectorised implementations
+  • sequence (optional)    – incremental generator for range queries
+  • job overrides          – looser bounds / exact output for /jobs
+
+Routes (single POST, batch POST, cacheable GET and, for operations with a
+sequence, a streaming GET /range) are generated from
+this table by `app.controllers.operation_controller`, so registering a
+new operation here is all it takes to publish it.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field, replace
+from functools import partial
+from typing import (Any, Callable, Dict, Iterator, List, Optional, Tuple,
+                    Type, Union)
+
+from pydantic import BaseModel
+
+from app.core.metrics import KERNEL_SECONDS
+from app.schemas.calculation_schema import (BinomialRequest,
+                                            FactorialRequest,
+                                            FibonacciRequest,
+                                            GcdRequest,
+                                            ModPowRequest,
+                                            PowerRequest)
+from app.services.math_service import (MAX_BINOMIAL_N,
+                                       MAX_FACTORIAL_N,
+                                       MAX_FIBONACCI_N,
+                                       MAX_JOB_FACTORIAL_N,
+                                       MAX_JOB_FIBONACCI_N,
+                                       MAX_LOG_N,
+                                       MAX_MODPOW_MODULUS,
+                                       MAX_POWER_COST,
+                                       Approx,
+                                       _binomial_cached,
+                                       _gcd_cached,
+                                       _modpow_cached,
+                                       factorial,
+                                       factorial_batch,
+                                       factorial_range,
+                                       fibonacci,
+                                       fibonacci_batch,
+                                       fibonacci_range,
+                                       int_to_decimal,
+                                       log_cached,
+                                       power,
+                                       power_cost,
+                                       run_logged)
+
+# Constants
+MAX_REQUEST_COST = 1_000_000  # Work units allowed for one call or batch
+DEFAULT_CACHE_MAX_AGE = 3_600  # Seconds; results are deterministic
+_FLOAT_EXACT_LIMIT = 2 ** 53  # Larger integers lose digits as floats
+
+Payload = Dict[str, Any]
+Bounds = Dict[str, Tuple[Optional[int], Optional[int]]]
+SequenceFn = Callable[[int, int, int], Iterator[Tuple[int, Any]]]
+
+
+@dataclass(frozen=True)
+class Operation:
+    """Declarative description of one math operation."""
+    name: str
+    request_model: Type[BaseModel]
+    kernel: Callable[..., Any]
+    summary: str
+    description: str
+    message: str
+    bounds: Bounds = field(default_factory=dict)
+    approx_bounds: Optional[Bounds] = None
+    cost: Callable[[Payload], int] = lambda payload: 1
+    max_cost: int = MAX_REQUEST_COST
+    batch_kernel: Optional[Callable[[List[Payload]], List[Any]]] = None
+    cache_max_age: int = DEFAULT_CACHE_MAX_AGE
+    format_result: Callable[[Any], Union[float, str]] = float
+    sequence: Optional[SequenceFn] = None
+    # Field values replaced in background jobs (see `for_jobs`)
+    job_overrides: Dict[str, Any] = field(default_factory=dict)
+
+    def for_jobs(self) -> "Operation":
+        """Variant run by background jobs: job bounds, exact output."""
+        if not self.job_overrides:
+            return self
+        return replace(self, job_overrides={}, **self.job_overrides)
+
+    def validate(self, payload: Payload,
+                 max_cost: Optional[int] = None) -> None:
+        """
+        Check declared bounds and the cost budget (`max_cost` overrides
+        the operation's own, e.g. for background jobs); raise ValueError.
+        """
+        max_cost = max_cost or self.max_cost
+        bounds = self.bounds
+        if self.approx_bounds is not None and \
+                payload.get("precision", "exact") != "exact":
+            bounds = self.approx_bounds
+        for name, (low, high) in bounds.items():
+            value = payload[name]
+            if low is not None and value < low:
+                raise ValueError(
+                    f"{name} must be non-negative ({name} >= 0)"
+                    if low == 0 else f"{name} must be at least {low}"
+                )
+            if high is not None and value > high:
+                raise ValueError(f"{name} must not exceed {high}")
+        cost = self.cost(payload)
+        if cost > max_cost:
+            raise ValueError(f"Request too expensive (cost {cost} exceeds "
+                             f"{max_cost})")
+
+    def compute(self, payload: Payload,
+                max_cost: Optional[int] = None) -> Any:
+        """Validate and run the single-call kernel (no logging)."""
+        self.validate(payload, max_cost)
+        start = time.perf_counter()
+        try:
+            return self.kernel(**payload)
+        finally:
+            KERNEL_SECONDS.observe(time.perf_counter() - start, (self.name,))
+
+    def compute_batch(self, payloads: List[Payload],
+                      max_cost: Optional[int] = None) -> List[Any]:
+        """
+        Validate every item, check the combined cost and run the
+        vectorised kernel (or fall back to mapping the single kernel).
+        """
+        max_cost = max_cost or self.max_cost
+        for index, payload in enumerate(payloads):
+            try:
+                self.validate(payload, max_cost)
+            except ValueError as e:
+                raise ValueError(f"items[{index}]: {e}") from None
+        exact = all(p.get("precision", "exact") == "exact" for p in payloads)
+        vectorised = self.batch_kernel is not None and exact
+        if vectorised:
+            # One shared sweep up to the largest item, plus one result of
+            # that item's size per distinct input (the batch kernels keep
+            # them all, and they have to be formatted)
+            costs = {frozenset(payload.items()): self.cost(payload)
+                     for payload in payloads}
+            total = max(costs.values(), default=0) + sum(costs.values())
+        else:
+            total = sum(self.cost(payload) for payload in payloads)
+        if total > max_cost:
+            raise ValueError(f"Batch too expensive (cost {total} "
+                             f"exceeds {max_cost})")
+        start = time.perf_counter()
+        try:
+            if not vectorised:
+                return [self.kernel(**payload) for payload in payloads]
+            return self.batch_kernel(payloads)
+        finally:
+            KERNEL_SECONDS.observe(time.perf_counter() - start,
+                                   (f"{self.name}.batch",))
+
+    def validate_range(self, start: int, stop: int, step: int) -> None:
+        """Check a range(start, stop, step) of `n` against the bounds."""
+        if self.sequence is None:
+            raise ValueError(f"{self.name} does not support ranges")
+        low, high = self.bounds.get("n", (0, None))
+        if start < (low or 0):
+            raise ValueError("start must be non-negative (start >= 0)")
+        if step < 1:
+            raise ValueError("step must be positive (step >= 1)")
+        if high is not None and stop > high + 1:
+            raise ValueError(f"stop must not exceed {high + 1}")
+
+    def calculate(self, payload: Payload) -> Any:
+        """Compute one result and log the call."""
+        return run_logged(self.name, payload,
+                          lambda: self.compute(payload),
+                          self.message)
+
+    def log_cached(self, payload: Payload,
+                   result: Optional[float]) -> None:
+        """Log a call answered from a cached earlier `calculate`."""
+        log_cached(self.name, payload, result, self.message)
+
+    def calculate_batch(self, payloads: List[Payload]) -> List[Any]:
+        """Compute a batch of results and log it as a single record."""
+        return run_logged(f"{self.name}.batch", {"items": payloads},
+                          lambda: self.compute_batch(payloads),
+                          f"Batch of {len(payloads)} calculated "
+                          f"successfully")
+
+    def calculate_range(self, start: int, stop: int,
+                        step: int = 1) -> Iterator[Tuple[int, Any]]:
+        """
+        Validate and log a range query as a single record, then return
+        the lazy term generator for the caller to stream.
+        """
+        run_logged(f"{self.name}.range",
+                   {"start": start, "stop": stop, "step": step},
+                   lambda: self.validate_range(start, stop, step),
+                   "Range generated successfully")
+        assert self.sequence is not None
+        return self.sequence(start, stop, step)
+
+
+# Registry
+OPERATIONS: Dict[str, Operation] = {}
+
+
+def register(operation: Operation) -> Operation:
+    """Add an operation to the registry (names must be unique)."""
+    if operation.name in OPERATIONS:
+        raise ValueError(f"Operation {operation.name!r} already registered")
+    OPERATIONS[operation.name] = operation
+    return operation
+
+
+def get_operation(name: str) -> Operation:
+    """Look up a registered operation; KeyError if unknown."""
+    return OPERATIONS[name]
+
+
+def _float_or_approx(result: Union[int, float, Approx]) -> Any:
+    """Approx results become {mantissa, exponent}; the rest floats."""
+    if isinstance(result, Approx):
+        return result._asdict()
+    return float(result)
+
+
+def _exact_cost(payload: Payload) -> int:
+    """O(n) exact kernels; the log-domain precisions are O(1)."""
+    if payload.get("precision", "exact") != "exact":
+        return 1
+    return payload["n"]
+
+
+def _exact_as_string(result: Union[int, float, Approx]) -> Any:
+    """Float results stay numeric; exact integers become decimal strings."""
+    if isinstance(result, int):
+        return int_to_decimal(result)
+    return _float_or_approx(result)
+
+
+register(Operation(
+    name="factorial",
+    request_model=FactorialRequest,
+    kernel=factorial,
+    summary="Compute factorial",
+    description=f"Calculate n! for a non-negative integer n "
+                f"(n ≤ {MAX_FACTORIAL_N}; up to {MAX_LOG_N:.0e} with "
+                f"precision 'log10' or 'approx').",
+    message="Factorial calculated successfully",
+    bounds={"n": (0, MAX_FACTORIAL_N)},
+    approx_bounds={"n": (0, MAX_LOG_N)},
+    cost=_exact_cost,
+    format_result=_float_or_approx,
+    batch_kernel=lambda items: factorial_batch([p["n"] for p in items]),
+    sequence=factorial_range,
+    job_overrides=dict(
+        kernel=partial(factorial, limit=MAX_JOB_FACTORIAL_N),
+        bounds={"n": (0, MAX_JOB_FACTORIAL_N)},
+        batch_kernel=lambda items: factorial_batch(
+            [p["n"] for p in items], limit=MAX_JOB_FACTORIAL_N),
+        format_result=_exact_as_string,
+    ),
+))
+
+register(Operation(
+    name="fibonacci",
+    request_model=FibonacciRequest,
+    kernel=fibonacci,
+    summary="Compute Fibonacci",
+    description=f"Return the n-th Fibonacci number for a non-negative "
+                f"integer n (n ≤ {MAX_FIBONACCI_N:,}; up to {MAX_LOG_N:.0e} "
+                f"with precision 'log10' or 'approx').",
+    message="Fibonacci number calculated successfully",
+    bounds={"n": (0, MAX_FIBONACCI_N)},
+    approx_bounds={"n": (0, MAX_LOG_N)},
+    cost=_exact_cost,
+    format_result=_float_or_approx,
+    batch_kernel=lambda items: fibonacci_batch([p["n"] for p in items]),
+    sequence=fibonacci_range,
+    job_overrides=dict(
+        kernel=partial(fibonacci, limit=MAX_JOB_FIBONACCI_N),
+        bounds={"n": (0, MAX_JOB_FIBONACCI_N)},
+        batch_kernel=lambda items: fibonacci_batch(
+            [p["n"] for p in items], limit=MAX_JOB_FIBONACCI_N),
+        format_result=_exact_as_string,
+    ),
+))
+
+
+register(Operation(
+    name="power",
+    request_model=PowerRequest,
+    kernel=power,
+    summary="Compute power",
+    description="Calculate baseⁿ where base is a float (or int) and "
+                "exponent is an integer (or float, and can be negative). "
+                "With mode='int' the exact integer result (optionally "
+                "mod `modulus`) is returned as a decimal string; precision "
+                "'log10'/'approx' answer results beyond float range.",
+    message="Power calculated successfully",
+    cost=lambda p: power_cost(**p),
+    max_cost=MAX_POWER_COST,
+    format_result=_exact_as_string,
+))
+
+register(Operation(
+    name="binomial",
+    request_model=BinomialRequest,
+    kernel=_binomial_cached,
+    summary="Compute binomial coefficient",
+    description=f"Return C(n, k), the number of ways to choose k items "
+                f"out of n (0 ≤ k ≤ n ≤ {MAX_BINOMIAL_N:,}).",
+    message="Binomial coefficient calculated successfully",
+    bounds={"n": (0, MAX_BINOMIAL_N), "k": (0, MAX_BINOMIAL_N)},
+    cost=lambda p: min(p["k"], max(p["n"] - p["k"], 0)),
+))
+
+register(Operation(
+    name="modpow",
+    request_model=ModPowRequest,
+    kernel=_modpow_cached,
+    summary="Compute modular exponentiation",
+    description="Return (base ** exponent) mod modulus using "
+                "square-and-multiply (1 ≤ modulus ≤ 2⁵³).",
+    message="Modular power calculated successfully",
+    bounds={"exponent": (0, None), "modulus": (1, MAX_MODPOW_MODULUS)},
+    cost=lambda p: max(p["exponent"], 1).bit_length(),
+))
+
+
+def _float_if_exact(result: int) -> Union[float, str]:
+    """Floats while exactly representable (|x| ≤ 2**53), else a string."""
+    if abs(result) <= _FLOAT_EXACT_LIMIT:
+        return float(result)
+    return int_to_decimal(result)
+
+
+register(Operation(
+    name="gcd",
+    request_model=GcdRequest,
+    kernel=lambda values: _gcd_cached(tuple(values)),
+    summary="Compute greatest common divisor",
+    description="Return the gcd of an array of integers (results above "
+                "2⁵³ are returned exactly, as decimal strings).",
+    message="GCD calculated successfully",
+    cost=lambda p: len(p["values"]),
+    format_result=_float_if_exact,
+))
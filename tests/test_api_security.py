@@ -0,0 +1,103 @@
+import json
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.api_security import APIKeyMiddleware, APIKeyStore, hash_key
+
+
+def _write_keys(path, *entries):
+    path.write_text(json.dumps({"keys": list(entries)}))
+
+
+@pytest.fixture
+def key_file(tmp_path):
+    path = tmp_path / "keys.json"
+    _write_keys(path,
+                {"id": "dash", "sha256": hash_key("dash-secret"),
+                 "scopes": ["logs"], "metadata": {"owner": "ops"}},
+                {"id": "calc", "sha256": hash_key("calc-secret")})
+    return path
+
+
+@pytest.fixture
+def store(key_file):
+    return APIKeyStore(str(key_file), legacy_key="legacy",
+                       reload_seconds=0)
+
+
+@pytest.fixture
+def secured(store):
+    app = FastAPI()
+    app.add_middleware(APIKeyMiddleware, store=store)
+
+    @app.get("/")
+    def health():
+        return {"status": "ok"}
+
+    @app.get("/logs/")
+    def logs():
+        return []
+
+    @app.get("/factorial/")
+    def factorial():
+        return {"result": 1}
+
+    with TestClient(app) as client:
+        yield client
+
+
+def test_store_indexes_hashed_keys(store):
+    assert len(store) == 3
+    record = store.lookup("dash-secret")
+    assert record.key_id == "dash"
+    assert record.metadata == {"owner": "ops"}
+    assert store.lookup("calc-secret").scopes == frozenset({"math"})
+    assert store.lookup("legacy").allows("anything")
+    assert store.lookup("nope") is None
+
+
+def test_store_hot_reloads_changed_file(store, key_file):
+    _write_keys(key_file, {"id": "new", "sha256": hash_key("new-secret")})
+    stat = os.stat(key_file)
+    os.utime(key_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert store.lookup("new-secret").key_id == "new"
+    assert store.lookup("dash-secret") is None
+
+
+def test_store_keeps_old_index_on_bad_file(store, key_file):
+    key_file.write_text("{not json")
+    stat = os.stat(key_file)
+    os.utime(key_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert store.lookup("dash-secret").key_id == "dash"
+
+
+def test_middleware_public_and_missing_key(secured):
+    assert secured.get("/").status_code == 200
+    response = secured.get("/factorial/")
+    assert response.status_code == 401
+    assert "Missing" in response.json()["detail"]
+
+
+def test_middleware_checks_scopes(secured):
+    assert secured.get("/logs/",
+                       headers={"X-API-Key": "dash-secret"}).status_code == 200
+    response = secured.get("/factorial/", headers={"X-API-Key": "dash-secret"})
+    assert response.status_code == 403
+    assert "scope" in response.json()["detail"]
+    assert secured.get("/factorial/",
+                       headers={"X-API-Key": "calc-secret"}).status_code == 200
+
+
+def test_middleware_rejects_unknown_key(secured):
+    response = secured.get("/logs/", headers={"X-API-Key": "wrong"})
+    assert response.status_code == 403
+    assert "Invalid" in response.json()["detail"]
+
+
+def test_openapi_marks_protected_routes(client):
+    paths = client.get("/openapi.json").json()["paths"]
+    assert paths["/factorial/"]["post"]["security"] == [{"MathAPIKey": []}]
+    assert "security" not in paths["/"]["get"]
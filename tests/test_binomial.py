@@ -0,0 +1,45 @@
+from app.core.app_config import API_KEY
+
+headers = {"X-API-Key": API_KEY}
+
+
+def test_binomial_valid(client):
+    response = client.post("/binomial/", json={"n": 5, "k": 2},
+                           headers=headers)
+    assert response.status_code == 201
+    assert response.json()["result"] == 10
+
+
+def test_binomial_edges(client):
+    response = client.post("/binomial/", json={"n": 7, "k": 0},
+                           headers=headers)
+    assert response.status_code == 201
+    assert response.json()["result"] == 1
+    response = client.post("/binomial/", json={"n": 7, "k": 7},
+                           headers=headers)
+    assert response.status_code == 201
+    assert response.json()["result"] == 1
+
+
+def test_binomial_k_greater_than_n(client):
+    response = client.post("/binomial/", json={"n": 3, "k": 4},
+                           headers=headers)
+    assert response.status_code == 400
+    assert "k must not exceed n" in response.json()["detail"]["message"]
+
+
+def test_binomial_too_large(client):
+    response = client.post("/binomial/", json={"n": 1001, "k": 2},
+                           headers=headers)
+    assert response.status_code == 400
+
+
+def test_binomial_negative(client):
+    response = client.post("/binomial/", json={"n": -1, "k": 0},
+                           headers=headers)
+    assert response.status_code == 400
+
+
+def test_binomial_missing_api_key(client):
+    response = client.post("/binomial/", json={"n": 5, "k": 2})
+    assert response.status_code == 401
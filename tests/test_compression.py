@@ -0,0 +1,114 @@
+import gzip
+import json
+from datetime import datetime, timezone
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.core import compression
+from app.core.app_config import API_KEY
+from app.core.compression import (ResponseCache, choose_encoding,
+                                  response_cache)
+
+headers = {"X-API-Key": API_KEY}
+GZIP = {**headers, "Accept-Encoding": "gzip"}
+
+
+def _logged(client, operation, since):
+    return len(client.get("/logs/", params={"operation": operation,
+                                            "since": since.isoformat()},
+                          headers=headers).json())
+
+
+def test_choose_encoding():
+    assert choose_encoding("gzip, deflate", ("br", "gzip")) == "gzip"
+    assert choose_encoding("gzip, br", ("br", "gzip")) == "br"
+    assert choose_encoding("gzip;q=1.0, br;q=0.5", ("br", "gzip")) == "gzip"
+    assert choose_encoding("*", ("br", "gzip")) == "br"
+    assert choose_encoding("*, gzip;q=0", ("gzip",)) is None
+    assert choose_encoding("identity", ("br", "gzip")) is None
+    assert choose_encoding("", ("gzip",)) is None
+
+
+def test_large_response_is_gzipped(client):
+    for n in range(20):
+        client.post("/factorial/", json={"n": n}, headers=headers)
+    response = client.get("/logs/", headers=GZIP)
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert "accept-encoding" in response.headers["vary"].lower()
+    assert len(response.json()) >= 20
+
+
+def test_identity_and_small_responses_are_not_compressed(client):
+    response = client.get("/logs/", headers={**headers,
+                                             "Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    response = client.get("/factorial/?n=5", headers=GZIP)
+    assert "content-encoding" not in response.headers
+    assert response.json()["result"] == 120
+
+
+def test_streamed_range_is_compressed_incrementally(client):
+    with client.stream("GET", "/fibonacci/range?stop=500",
+                       headers=GZIP) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        raw = b"".join(response.iter_raw())
+    lines = gzip.decompress(raw).decode().splitlines()
+    assert len(lines) == 500
+    assert json.loads(lines[10]) == {"n": 10, "result": 55.0}
+
+
+def test_cacheable_get_reuses_response_and_variants(client, monkeypatch):
+    calls = []
+    real_compress = compression.compress
+
+    def counting(data, encoding):
+        calls.append(encoding)
+        return real_compress(data, encoding)
+
+    monkeypatch.setattr(compression, "compress", counting)
+    url = "/power/?base=3&exponent=5001&mode=int"
+    since = datetime.now(timezone.utc)
+    labels = {"operation": "power"}
+    plain = client.get(url, headers={**headers,
+                                     "Accept-Encoding": "identity"})
+    kernel_runs = REGISTRY.get_sample_value("math_kernel_seconds_count",
+                                            labels)
+    first = client.get(url, headers=GZIP)
+    second = client.get(url, headers=GZIP)
+    assert "content-encoding" not in plain.headers
+    assert first.headers["content-encoding"] == "gzip"
+    assert first.headers["vary"] == "Accept-Encoding"
+    # Same body (timestamp included) for every encoding, kernel run once
+    assert first.json() == second.json() == plain.json()
+    assert REGISTRY.get_sample_value("math_kernel_seconds_count",
+                                     labels) == kernel_runs
+    assert calls == ["gzip"]
+    assert response_cache.get(first.headers["etag"], "gzip") is not None
+    # Cache hits are counted and still logged, with the cached result
+    assert REGISTRY.get_sample_value(
+        "math_response_cache_reads_total",
+        {"operation": "power", "result": "hit"}) >= 2
+    assert _logged(client, "power", since) == 3
+
+
+def test_response_cache_evicts_by_size_and_age():
+    cache = ResponseCache(max_bytes=10)
+    cache.put("a", b"x" * 6, max_age=60)
+    cache.put("b", b"y" * 6, max_age=60, meta=1.5)
+    assert cache.get("a") is None
+    assert cache.get("b") == b"y" * 6
+    assert cache.lookup("b") == (b"y" * 6, 1.5)
+    cache.put("c", b"z", max_age=0)
+    assert cache.get("c") is None
+    assert len(cache) == 1
+
+
+def test_brotli(client):
+    pytest.importorskip("brotli")
+    response = client.get("/logs/", headers={**headers,
+                                             "Accept-Encoding": "br"})
+    assert response.headers["content-encoding"] == "br"
+    assert isinstance(response.json(), list)
@@ -1,3 +1,6 @@
+import json
+import math
+
 from app.core.app_config import API_KEY
 
 headers = {"X-API-Key": API_KEY}
@@ -30,6 +33,71 @@ def test_factorial_invalid_type(client):
     assert response.status_code == 422
 
 
+def test_factorial_log10_beyond_float_range(client):
+    response = client.post("/factorial/",
+                           json={"n": 1000, "precision": "log10"},
+                           headers=headers)
+    assert response.status_code == 201
+    expected = math.log10(math.factorial(1000))
+    assert abs(response.json()["result"] - expected) < 1e-9
+
+
+def test_factorial_approx(client):
+    response = client.post("/factorial/",
+                           json={"n": 1000, "precision": "approx"},
+                           headers=headers)
+    assert response.status_code == 201
+    exact = str(math.factorial(1000))
+    result = response.json()["result"]
+    assert result["exponent"] == len(exact) - 1
+    assert str(result["mantissa"]).replace(".", "")[:8] == exact[:8]
+
+
+def test_factorial_approx_huge_n(client):
+    response = client.get("/factorial/",
+                          params={"n": 10 ** 9, "precision": "approx"},
+                          headers=headers)
+    assert response.status_code == 200
+    assert response.json()["result"]["exponent"] == 8_565_705_522
+
+
+def test_factorial_log10_limit(client):
+    response = client.post("/factorial/",
+                           json={"n": 10 ** 10 + 1, "precision": "log10"},
+                           headers=headers)
+    assert response.status_code == 400
+
+
+def test_factorial_range(client):
+    response = client.get("/factorial/range?stop=6", headers=headers)
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["n"] for line in lines] == list(range(6))
+    assert [line["result"] for line in lines] == [1, 1, 2, 6, 24, 120]
+
+
+def test_factorial_range_step(client):
+    response = client.get("/factorial/range",
+                          params={"start": 2, "stop": 7, "step": 2},
+                          headers=headers)
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["n"] for line in lines] == [2, 4, 6]
+
+
+def test_factorial_range_full(client):
+    response = client.get("/factorial/range?stop=171", headers=headers)
+    assert response.status_code == 200
+    assert len(response.text.splitlines()) == 171
+
+
+def test_factorial_range_out_of_bounds(client):
+    response = client.get("/factorial/range?stop=172", headers=headers)
+    assert response.status_code == 400
+    response = client.get("/factorial/range?stop=5&step=0", headers=headers)
+    assert response.status_code == 400
+
+
 def test_factorial_missing_api_key(client):
     response = client.post("/factorial/", json={"n": 5})  # No headers
     assert response.status_code == 401
@@ -1,3 +1,6 @@
+import json
+import math
+
 from app.core.app_config import API_KEY
 
 headers = {"X-API-Key": API_KEY}
@@ -30,6 +33,69 @@ def test_fibonacci_invalid_type(client):
     assert response.status_code == 422
 
 
+def _fib(n):
+    a, b = 0, 1
+    for _ in range(n):
+        a, b = b, a + b
+    return a
+
+
+def test_fibonacci_log10_binet(client):
+    response = client.post("/fibonacci/",
+                           json={"n": 5000, "precision": "log10"},
+                           headers=headers)
+    assert response.status_code == 201
+    assert abs(response.json()["result"] - math.log10(_fib(5000))) < 1e-9
+
+
+def test_fibonacci_approx(client):
+    response = client.post("/fibonacci/",
+                           json={"n": 5000, "precision": "approx"},
+                           headers=headers)
+    assert response.status_code == 201
+    exact = str(_fib(5000))
+    result = response.json()["result"]
+    assert result["exponent"] == len(exact) - 1
+    assert str(result["mantissa"]).replace(".", "")[:8] == exact[:8]
+
+
+def test_fibonacci_log10_of_zero(client):
+    response = client.post("/fibonacci/",
+                           json={"n": 0, "precision": "log10"},
+                           headers=headers)
+    assert response.status_code == 400
+
+
+def test_fibonacci_range(client):
+    response = client.get("/fibonacci/range?stop=8", headers=headers)
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["n"] for line in lines] == list(range(8))
+    assert [line["result"] for line in lines] == [0, 1, 1, 2, 3, 5, 8, 13]
+
+
+def test_fibonacci_range_step(client):
+    response = client.get("/fibonacci/range",
+                          params={"start": 2, "stop": 7, "step": 2},
+                          headers=headers)
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["n"] for line in lines] == [2, 4, 6]
+
+
+def test_fibonacci_range_full(client):
+    response = client.get("/fibonacci/range?stop=1477", headers=headers)
+    assert response.status_code == 200
+    assert len(response.text.splitlines()) == 1477
+
+
+def test_fibonacci_range_out_of_bounds(client):
+    response = client.get("/fibonacci/range?stop=1478", headers=headers)
+    assert response.status_code == 400
+    response = client.get("/fibonacci/range?stop=5&step=0", headers=headers)
+    assert response.status_code == 400
+
+
 def test_fibonacci_missing_api_key(client):
     response = client.post("/fibonacci/", json={"n": 5})  # No headers
     assert response.status_code == 401
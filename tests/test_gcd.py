@@ -0,0 +1,45 @@
+from app.core.app_config import API_KEY
+
+headers = {"X-API-Key": API_KEY}
+
+
+def test_gcd_valid(client):
+    response = client.post("/gcd/", json={"values": [12, 18, 30]},
+                           headers=headers)
+    assert response.status_code == 201
+    assert response.json()["result"] == 6
+
+
+def test_gcd_single_and_negative(client):
+    response = client.post("/gcd/", json={"values": [-21]}, headers=headers)
+    assert response.status_code == 201
+    assert response.json()["result"] == 21
+
+
+def test_gcd_all_zero(client):
+    response = client.post("/gcd/", json={"values": [0, 0]}, headers=headers)
+    assert response.status_code == 201
+    assert response.json()["result"] == 0
+
+
+def test_gcd_empty(client):
+    response = client.post("/gcd/", json={"values": []}, headers=headers)
+    assert response.status_code == 422
+
+
+def test_gcd_query_parameters(client):
+    response = client.get("/gcd/?values=14&values=49", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["result"] == 7
+
+
+def test_gcd_huge_values_are_exact(client):
+    big = 10 ** 400
+    response = client.post("/gcd/", json={"values": [big, 3 * big]},
+                           headers=headers)
+    assert response.status_code == 201
+    assert response.json()["result"] == str(big)
+
+    response = client.post("/gcd/", json={"values": [2 ** 53 + 1]},
+                           headers=headers)
+    assert response.json()["result"] == str(2 ** 53 + 1)
@@ -0,0 +1,170 @@
+import math
+import time
+
+import pytest
+
+from app.core.app_config import API_KEY
+from app.services.job_service import JobManager, job_manager
+
+headers = {"X-API-Key": API_KEY}
+
+
+@pytest.fixture(autouse=True)
+def result_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_manager, "result_dir", str(tmp_path))
+
+
+def _wait(client, job_id, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/jobs/{job_id}", headers=headers).json()
+        if job["status"] in ("done", "error"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_job_single_exact_power(client):
+    response = client.post("/jobs/",
+                           json={"operation": "power",
+                                 "input": {"base": 2, "exponent": 12_000,
+                                           "mode": "int"}},
+                           headers=headers)
+    assert response.status_code == 202
+    job_id = response.json()["id"]
+    assert response.headers["location"] == f"/jobs/{job_id}"
+
+    job = _wait(client, job_id)
+    assert job["status"] == "done"
+    assert job["runtime_seconds"] is not None
+
+    result = client.get(f"/jobs/{job_id}/result",
+                        headers={**headers, "Accept-Encoding": "identity"})
+    assert result.status_code == 200
+    assert int(result.headers["content-length"]) == job["result_size"]
+    assert result.json()["result"] == str(2 ** 12_000)
+
+
+def test_job_exact_factorial_beyond_sync_bound(client):
+    response = client.post("/factorial/", json={"n": 1000}, headers=headers)
+    assert response.status_code == 400
+    response = client.post("/jobs/",
+                           json={"operation": "factorial",
+                                 "input": {"n": 1000}},
+                           headers=headers)
+    assert response.status_code == 202
+    job = _wait(client, response.json()["id"])
+    assert job["status"] == "done"
+    result = client.get(f"/jobs/{job['id']}/result", headers=headers).json()
+    assert result["result"] == str(math.factorial(1000))
+
+
+def test_job_exact_fibonacci_and_job_bound(client):
+    response = client.post("/jobs/",
+                           json={"operation": "fibonacci",
+                                 "input": {"n": 5000}},
+                           headers=headers)
+    job = _wait(client, response.json()["id"])
+    result = client.get(f"/jobs/{job['id']}/result", headers=headers).json()
+    a, b = 0, 1
+    for _ in range(5000):
+        a, b = b, a + b
+    assert result["result"] == str(a)
+
+    response = client.post("/jobs/",
+                           json={"operation": "fibonacci",
+                                 "input": {"n": 10 ** 7}},
+                           headers=headers)
+    assert response.status_code == 400
+    assert "must not exceed 1000000" in response.json()["detail"]["message"]
+
+
+def test_job_batch(client):
+    items = [{"n": n % 30} for n in range(50_000)]
+    response = client.post("/jobs/",
+                           json={"operation": "fibonacci", "items": items},
+                           headers=headers)
+    assert response.status_code == 202
+    job = _wait(client, response.json()["id"])
+    assert job["status"] == "done"
+    results = client.get(f"/jobs/{job['id']}/result",
+                         headers=headers).json()["results"]
+    assert len(results) == 50_000
+    assert results[:8] == ["0", "1", "1", "2", "3", "5", "8", "13"]
+
+
+def test_job_batch_item_error(client):
+    response = client.post("/jobs/",
+                           json={"operation": "factorial",
+                                 "items": [{"n": 5}, {"n": 100_001}]},
+                           headers=headers)
+    job = _wait(client, response.json()["id"])
+    assert job["status"] == "error"
+    assert job["message"].startswith("items[1]")
+    result = client.get(f"/jobs/{job['id']}/result", headers=headers)
+    assert result.status_code == 409
+
+
+def test_job_batch_rejected_on_total_cost(client):
+    # Every item is within the job bound, but all the distinct results
+    # together would be far too large to keep
+    items = [{"n": n} for n in range(10_000, 20_000)]
+    response = client.post("/jobs/",
+                           json={"operation": "fibonacci", "items": items},
+                           headers=headers)
+    job = _wait(client, response.json()["id"])
+    assert job["status"] == "error"
+    assert "Batch too expensive" in job["message"]
+
+
+def test_job_rejected_up_front(client):
+    response = client.post("/jobs/",
+                           json={"operation": "nope", "input": {}},
+                           headers=headers)
+    assert response.status_code == 400
+    response = client.post("/jobs/",
+                           json={"operation": "factorial",
+                                 "input": {"n": -1}},
+                           headers=headers)
+    assert response.status_code == 400
+    response = client.post("/jobs/", json={"operation": "factorial"},
+                           headers=headers)
+    assert response.status_code == 400
+
+
+def test_stale_result_files_removed_when_pool_starts(tmp_path):
+    stale = tmp_path / f"{'a' * 32}.json"
+    stale.write_text("{}")
+    partial = tmp_path / f"{'b' * 32}.json.part"
+    partial.write_text("{")
+    other = tmp_path / "notes.json"
+    other.write_text("{}")
+    manager = JobManager(result_dir=str(tmp_path), workers=1)
+    try:
+        manager._pool()
+    finally:
+        manager.shutdown()
+    assert not stale.exists()
+    assert not partial.exists()
+    assert other.exists()
+
+
+def test_job_invalid_input_is_422(client):
+    response = client.post("/jobs/",
+                           json={"operation": "factorial",
+                                 "input": {"n": "many"}},
+                           headers=headers)
+    assert response.status_code == 422
+    [error] = response.json()["detail"]
+    assert error["loc"] == ["body", "input", "n"]
+    assert error["type"] == "int_parsing"
+
+
+def test_job_unknown_id(client):
+    assert client.get("/jobs/missing", headers=headers).status_code == 404
+
+
+def test_job_metrics_exposed(client):
+    text = client.get("/metrics", headers=headers).text
+    assert "math_jobs_queue_depth" in text
+    assert "math_job_runtime_seconds" in text
@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+
+from app.core.metrics import LOG_BUFFER_READS
+from app.database.db_connection import _read_only_engine
+from app.database.log_buffer import LogBuffer
+from app.database.log_partitions import LogPartitions
+
+NOW = datetime(2026, 3, 18, 12, 0, 0)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    return create_engine(f"sqlite:///{tmp_path / 'logs.db'}")
+
+
+def _row(ts, operation="factorial", status="success"):
+    return {"operation": operation, "input": {"n": 5}, "result": 120.0,
+            "timestamp": ts, "status": status, "message": None}
+
+
+def _reads():
+    return dict(LOG_BUFFER_READS.totals())
+
+
+def test_buffer_keeps_newest_rows_in_order():
+    buffer = LogBuffer(capacity=3)
+    for minutes in (0, 2, 1, 3):  # one row arrives late
+        buffer.append(_row(NOW + timedelta(minutes=minutes)))
+    records = buffer.query(10, since=NOW)
+    assert records is None  # the oldest row was evicted
+    records = buffer.query(3)
+    assert [r.timestamp.minute for r in records] == [3, 2, 1]
+    assert buffer.horizon == NOW
+
+
+def test_buffer_answers_only_when_complete():
+    buffer = LogBuffer(capacity=3)
+    for minutes in range(5):
+        buffer.append(_row(NOW + timedelta(minutes=minutes),
+                           operation="power" if minutes else "gcd"))
+    assert len(buffer.query(2, operation="power")) == 2
+    # Only 3 power rows are kept; a 4th may sit in the database
+    assert buffer.query(4, operation="power") is None
+    assert buffer.query(4, operation="power",
+                        since=NOW + timedelta(minutes=2)) is not None
+    assert buffer.query(4, operation="gcd") is None
+
+
+def test_buffer_max_age():
+    buffer = LogBuffer(capacity=100, max_age=timedelta(minutes=10))
+    for minutes in (0, 5, 20):
+        buffer.append(_row(NOW + timedelta(minutes=minutes)))
+    assert len(buffer) == 1
+    assert buffer.horizon == NOW + timedelta(minutes=5)
+
+
+def test_records_use_slots():
+    buffer = LogBuffer(capacity=1)
+    buffer.append(_row(NOW))
+    record = buffer.query(1)[0]
+    assert not hasattr(record, "__dict__")
+
+
+def test_recent_served_from_buffer(engine):
+    logs = LogPartitions(engine, retention_days=0,
+                         buffer=LogBuffer(capacity=100))
+    logs.load()
+    for minutes in range(5):
+        logs.insert(_row(NOW + timedelta(minutes=minutes)))
+    before = _reads()
+    rows = logs.recent(3)
+    assert [row.timestamp.minute for row in rows] == [4, 3, 2]
+    assert _reads().get(("hit",), 0) == before.get(("hit",), 0) + 1
+
+
+def test_recent_falls_back_to_database(engine):
+    logs = LogPartitions(engine, retention_days=0)
+    for minutes in range(5):
+        logs.insert(_row(NOW + timedelta(minutes=minutes)))
+
+    mirrored = LogPartitions(engine, retention_days=0,
+                             buffer=LogBuffer(capacity=2))
+    mirrored.load()  # seeded with the 2 newest rows
+    before = _reads()
+    rows = mirrored.recent(4)
+    assert [row.timestamp.minute for row in rows] == [4, 3, 2, 1]
+    assert _reads().get(("miss",), 0) == before.get(("miss",), 0) + 1
+    assert len(mirrored.recent(2)) == 2
+    assert _reads().get(("hit",), 0) == before.get(("hit",), 0) + 1
+
+
+def test_read_only_engine(engine):
+    logs = LogPartitions(engine, retention_days=0)
+    logs.load()
+    logs.insert(_row(NOW))
+    reader = _read_only_engine(engine)
+    assert reader is not engine
+    reading = LogPartitions(engine, retention_days=0, read_engine=reader)
+    reading.load()
+    assert len(reading.recent(5)) == 1
+    with pytest.raises(OperationalError):
+        with reader.begin() as conn:
+            conn.exec_driver_sql("DELETE FROM requests_20260318")
+
+
+def test_memory_database_reuses_engine():
+    engine = create_engine("sqlite://")
+    assert _read_only_engine(engine) is engine
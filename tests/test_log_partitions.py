@@ -0,0 +1,104 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, inspect
+
+from app.database.log_partitions import LogPartitions
+
+NOW = datetime(2026, 3, 18, 12, 0, 0)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    return create_engine(f"sqlite:///{tmp_path / 'logs.db'}")
+
+
+def _row(ts, operation="factorial", status="success"):
+    return {"operation": operation, "input": {"n": 5}, "result": 120.0,
+            "timestamp": ts, "status": status, "message": None}
+
+
+def test_rows_go_to_daily_partitions(engine):
+    logs = LogPartitions(engine, interval="day", retention_days=0)
+    logs.load()
+    for days in range(3):
+        logs.insert(_row(NOW - timedelta(days=days)))
+    names = set(inspect(engine).get_table_names())
+    assert {"requests_20260318", "requests_20260317",
+            "requests_20260316"} <= names
+
+
+def test_weekly_partitions_start_on_monday(engine):
+    logs = LogPartitions(engine, interval="week", retention_days=0)
+    logs.insert(_row(NOW))                       # Wednesday
+    logs.insert(_row(NOW - timedelta(days=2)))   # Monday, same week
+    assert inspect(engine).get_table_names() == ["requests_20260316"]
+
+
+def test_retention_drops_whole_partitions(engine):
+    logs = LogPartitions(engine, interval="day", retention_days=2)
+    for days in range(5):
+        logs.insert(_row(NOW - timedelta(days=4 - days)))
+    dropped = logs.drop_expired(now=NOW)
+    assert dropped == []  # already expired while inserting newer days
+    assert sorted(inspect(engine).get_table_names()) == [
+        "requests_20260316", "requests_20260317", "requests_20260318"]
+
+
+def test_recent_reads_newest_first_and_stops_early(engine):
+    logs = LogPartitions(engine, interval="day", retention_days=0)
+    for days in range(3):
+        logs.insert(_row(NOW - timedelta(days=days), operation=f"op{days}"))
+    rows = logs.recent(2)
+    assert [row.operation for row in rows] == ["op0", "op1"]
+    rows = logs.recent(10, operation="op2")
+    assert len(rows) == 1
+
+
+def test_recent_only_touches_partitions_in_range(engine):
+    logs = LogPartitions(engine, interval="day", retention_days=0)
+    for days in range(5):
+        logs.insert(_row(NOW - timedelta(days=days)))
+    since = NOW - timedelta(days=2, hours=1)
+    until = NOW - timedelta(days=1)
+    touched = [t.name for t in logs.partitions(since, until)]
+    assert touched == ["requests_20260317", "requests_20260316"]
+    assert len(logs.recent(10, since=since, until=until)) == 2
+
+
+def test_load_discovers_partitions_and_enables_incremental_vacuum(
+        engine, tmp_path):
+    sqlite3.connect(tmp_path / "logs.db").execute(
+        "CREATE TABLE unrelated (id INTEGER)").connection.commit()
+    LogPartitions(engine, retention_days=0).insert(_row(NOW))
+
+    logs = LogPartitions(engine, retention_days=0)
+    logs.load()
+    assert [t.name for t in logs.partitions()] == ["requests_20260318"]
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() == 2
+
+
+def test_load_migrates_legacy_requests_table(engine, tmp_path):
+    conn = sqlite3.connect(tmp_path / "logs.db")
+    conn.execute("CREATE TABLE requests (id INTEGER PRIMARY KEY, "
+                 "operation VARCHAR NOT NULL, input JSON NOT NULL, "
+                 "result FLOAT, timestamp DATETIME NOT NULL, "
+                 "status VARCHAR NOT NULL, message VARCHAR)")
+    old = datetime.now() - timedelta(days=40)
+    days = [datetime.now() - timedelta(days=d, minutes=5) for d in (0, 1)]
+    for ts, operation in [(days[1], "op1"), (days[0], "op0"), (old, "old")]:
+        conn.execute("INSERT INTO requests (operation, input, result, "
+                     "timestamp, status) VALUES (?, '{\"n\": 5}', 120.0, "
+                     "?, 'success')", (operation, ts.isoformat(" ")))
+    conn.commit()
+    conn.close()
+
+    logs = LogPartitions(engine, retention_days=30)
+    logs.load()
+    assert "requests" not in inspect(engine).get_table_names()
+    assert len(logs.partitions()) == 2
+    rows = logs.recent(10)
+    assert [row.operation for row in rows] == ["op0", "op1"]
+    assert rows[0].input == {"n": 5}
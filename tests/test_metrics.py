@@ -0,0 +1,107 @@
+import threading
+
+from prometheus_client import REGISTRY
+from starlette.routing import Route
+
+from app.core.app_config import API_KEY
+from app.core.metrics import (ExpositionCache, ShardedCounter,
+                              ShardedHistogram, route_template)
+
+headers = {"X-API-Key": API_KEY}
+
+
+def _sample(name, labels=None):
+    return REGISTRY.get_sample_value(name, labels or {})
+
+
+def test_sharded_counter_sums_threads():
+    counter = ShardedCounter("test_counter", "doc", ("kind",))
+
+    def work():
+        for _ in range(1000):
+            counter.inc(("a",))
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    counter.inc(("b",), 2)
+    assert counter.totals() == {("a",): 4000.0, ("b",): 2.0}
+
+
+def test_sharded_histogram_buckets_are_cumulative():
+    histogram = ShardedHistogram("test_hist", "doc", buckets=(1.0, 2.0))
+    for value in (0.5, 1.0, 1.5, 3.0):
+        histogram.observe(value)
+    family = histogram.collect()
+    samples = {(s.name, s.labels.get("le")): s.value
+               for s in family.samples}
+    assert samples[("test_hist_bucket", "1.0")] == 2
+    assert samples[("test_hist_bucket", "2.0")] == 3
+    assert samples[("test_hist_bucket", "+Inf")] == 4
+    assert samples[("test_hist_count", None)] == 4
+    assert samples[("test_hist_sum", None)] == 6.0
+
+
+def test_requests_counted_per_route_template(client):
+    labels = {"method": "GET", "handler": "/factorial/", "status": "200"}
+    before = _sample("http_requests_total", labels) or 0
+    client.get("/factorial/?n=5", headers=headers)
+    client.get("/factorial/?n=6", headers=headers)
+    assert _sample("http_requests_total", labels) == before + 2
+
+
+def test_unmatched_paths_share_one_label(client):
+    labels = {"method": "GET", "handler": "none", "status": "404"}
+    before = _sample("http_requests_total", labels) or 0
+    client.get("/no/such/route/1", headers=headers)
+    client.get("/no/such/route/2", headers=headers)
+    assert _sample("http_requests_total", labels) == before + 2
+
+
+def test_kernel_and_cache_metrics(client):
+    before = _sample("math_kernel_seconds_count",
+                     {"operation": "binomial"}) or 0
+    hits = _sample("math_kernel_cache_hits_total",
+                   {"kernel": "binomial_cached"})
+    client.post("/binomial/", json={"n": 40, "k": 7}, headers=headers)
+    client.post("/binomial/", json={"n": 40, "k": 7}, headers=headers)
+    assert _sample("math_kernel_seconds_count",
+                   {"operation": "binomial"}) == before + 2
+    assert _sample("math_kernel_cache_hits_total",
+                   {"kernel": "binomial_cached"}) >= hits + 1
+    assert _sample("math_log_write_seconds_count") >= 2
+
+
+def test_exposition_is_cached():
+    cache = ExpositionCache(ttl=60)
+    first = cache.render()
+    ShardedCounter("unused", "doc").inc()
+    assert cache.render() is first
+    assert ExpositionCache(ttl=0).render() is not first
+
+
+def test_metrics_endpoint(client):
+    response = client.get("/metrics", headers=headers)
+    assert response.status_code == 200
+    assert "http_request_duration_seconds" in response.text
+    assert "math_kernel_seconds" in response.text
+
+
+def test_route_template_keeps_path_parameters(client):
+    labels = {"method": "GET", "handler": "/jobs/{job_id}", "status": "404"}
+    before = _sample("http_requests_total", labels) or 0
+    client.get("/jobs/first", headers=headers)
+    client.get("/jobs/second", headers=headers)
+    assert _sample("http_requests_total", labels) == before + 2
+
+
+def test_route_template_uses_full_route_path():
+    route = Route("/jobs/{job_id}", lambda request: None)
+    assert route_template({"route": route, "path": "/jobs/7"}) == \
+        "/jobs/{job_id}"
+    local = Route("/{job_id}", lambda request: None)
+    assert route_template({"route": local, "path": "/jobs/7"}) == \
+        "/jobs/{job_id}"
+    assert route_template({"path": "/nowhere"}) == "none"
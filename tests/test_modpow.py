@@ -0,0 +1,47 @@
+from app.core.app_config import API_KEY
+
+headers = {"X-API-Key": API_KEY}
+
+
+def test_modpow_valid(client):
+    response = client.post("/modpow/",
+                           json={"base": 4, "exponent": 13, "modulus": 497},
+                           headers=headers)
+    assert response.status_code == 201
+    assert response.json()["result"] == 445
+
+
+def test_modpow_huge_exponent(client):
+    exponent = 10 ** 30
+    response = client.post("/modpow/",
+                           json={"base": 3, "exponent": exponent,
+                                 "modulus": 1_000_007},
+                           headers=headers)
+    assert response.status_code == 201
+    assert response.json()["result"] == pow(3, exponent, 1_000_007)
+
+
+def test_modpow_negative_exponent(client):
+    response = client.post("/modpow/",
+                           json={"base": 3, "exponent": -1, "modulus": 7},
+                           headers=headers)
+    assert response.status_code == 400
+
+
+def test_modpow_bad_modulus(client):
+    response = client.post("/modpow/",
+                           json={"base": 3, "exponent": 2, "modulus": 0},
+                           headers=headers)
+    assert response.status_code == 400
+    response = client.post("/modpow/",
+                           json={"base": 3, "exponent": 2,
+                                 "modulus": 2 ** 53 + 1},
+                           headers=headers)
+    assert response.status_code == 400
+
+
+def test_modpow_invalid_type(client):
+    response = client.post("/modpow/",
+                           json={"base": 2.5, "exponent": 2, "modulus": 7},
+                           headers=headers)
+    assert response.status_code == 422
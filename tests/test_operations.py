@@ -0,0 +1,108 @@
+import inspect
+
+from prometheus_client import REGISTRY
+
+from app.controllers.operation_controller import build_router
+from app.core.app_config import API_KEY
+from app.services.operation_registry import OPERATIONS
+
+headers = {"X-API-Key": API_KEY}
+
+
+def test_every_operation_has_generated_routes(client):
+    paths = client.get("/openapi.json").json()["paths"]
+    for name in OPERATIONS:
+        assert "post" in paths[f"/{name}/"]
+        assert "get" in paths[f"/{name}/"]
+        assert "post" in paths[f"/{name}/batch"]
+
+
+def test_factorial_batch(client):
+    response = client.post("/factorial/batch",
+                           json={"items": [{"n": 5}, {"n": 0}, {"n": 10}]},
+                           headers=headers)
+    assert response.status_code == 201
+    assert response.json()["results"] == [120, 1, 3_628_800]
+
+
+def test_fibonacci_batch(client):
+    response = client.post("/fibonacci/batch",
+                           json={"items": [{"n": 7}, {"n": 1}, {"n": 7}]},
+                           headers=headers)
+    assert response.status_code == 201
+    assert response.json()["results"] == [13, 1, 13]
+
+
+def test_power_batch_falls_back_to_single_kernel(client):
+    response = client.post("/power/batch",
+                           json={"items": [{"base": 2, "exponent": 3},
+                                           {"base": 2, "exponent": -1}]},
+                           headers=headers)
+    assert response.status_code == 201
+    assert response.json()["results"] == [8, 0.5]
+
+
+def test_batch_reports_bad_item(client):
+    response = client.post("/factorial/batch",
+                           json={"items": [{"n": 5}, {"n": 171}]},
+                           headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"]["message"].startswith("items[1]")
+
+
+def test_batch_empty(client):
+    response = client.post("/factorial/batch", json={"items": []},
+                           headers=headers)
+    assert response.status_code == 422
+
+
+def test_get_route_sets_cache_headers(client):
+    response = client.get("/factorial/?n=5", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["result"] == 120
+    assert "max-age" in response.headers["cache-control"]
+    etag = response.headers["etag"]
+
+    response = client.get("/factorial/?n=5",
+                          headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+
+
+def test_get_route_304_skips_the_kernel(client):
+    etag = client.get("/factorial/?n=7", headers=headers).headers["etag"]
+    labels = {"operation": "factorial"}
+    before = REGISTRY.get_sample_value("math_kernel_seconds_count", labels)
+    response = client.get("/factorial/?n=7",
+                          headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert REGISTRY.get_sample_value("math_kernel_seconds_count",
+                                     labels) == before
+
+
+def test_get_route_out_of_range(client):
+    response = client.get("/fibonacci/?n=1477", headers=headers)
+    assert response.status_code == 400
+
+
+def test_z_logs_include_batch(client):
+    response = client.get("/logs/", params={"operation": "factorial.batch"},
+                          headers=headers)
+    assert response.status_code == 200
+    assert any(log["input"] == {"items": [{"n": 5}, {"n": 0}, {"n": 10}]}
+               for log in response.json())
+
+
+def test_z_logs_range_as_single_record(client):
+    client.get("/fibonacci/range?start=3&stop=900&step=3", headers=headers)
+    response = client.get("/logs/", params={"operation": "fibonacci.range"},
+                          headers=headers)
+    matching = [log for log in response.json()
+                if log["input"] == {"start": 3, "stop": 900, "step": 3}]
+    assert len(matching) >= 1
+    assert matching[0]["status"] == "success"
+
+
+def test_handlers_run_in_the_threadpool():
+    # Kernels are CPU-bound: async handlers would block the event loop
+    for route in build_router(OPERATIONS["power"]).routes:
+        assert not inspect.iscoroutinefunction(route.endpoint), route.name
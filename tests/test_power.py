@@ -62,6 +62,91 @@ def test_power_overflow(client):
     assert "overflows" in response.json()["detail"]["message"]
 
 
+def test_power_int_mode_exact(client):
+    response = client.post("/power/",
+                           json={"base": 2, "exponent": 10_000,
+                                 "mode": "int"},
+                           headers=headers)
+    assert response.status_code == 201
+    assert response.json()["result"] == str(2 ** 10_000)
+
+
+def test_power_int_mode_modulus(client):
+    exponent = 2 ** 4096 + 1
+    response = client.post("/power/",
+                           json={"base": 7, "exponent": exponent,
+                                 "mode": "int", "modulus": 1_000_000_007},
+                           headers=headers)
+    assert response.status_code == 201
+    assert response.json()["result"] == str(pow(7, exponent, 1_000_000_007))
+
+
+def test_power_int_mode_modular_inverse(client):
+    response = client.post("/power/",
+                           json={"base": 3, "exponent": -1,
+                                 "mode": "int", "modulus": 7},
+                           headers=headers)
+    assert response.status_code == 201
+    assert response.json()["result"] == "5"
+
+
+def test_power_int_mode_rejects_fractions(client):
+    response = client.post("/power/",
+                           json={"base": 2.5, "exponent": 3, "mode": "int"},
+                           headers=headers)
+    assert response.status_code == 400
+    response = client.post("/power/",
+                           json={"base": 2, "exponent": -3, "mode": "int"},
+                           headers=headers)
+    assert response.status_code == 400
+
+
+def test_power_int_mode_too_expensive(client):
+    response = client.post("/power/",
+                           json={"base": 2, "exponent": 10 ** 8,
+                                 "mode": "int"},
+                           headers=headers)
+    assert response.status_code == 400
+    assert "too expensive" in response.json()["detail"]["message"]
+
+
+def test_power_modulus_requires_int_mode(client):
+    response = client.post("/power/",
+                           json={"base": 2, "exponent": 3, "modulus": 5},
+                           headers=headers)
+    assert response.status_code == 400
+
+
+def test_power_log10_beyond_float_range(client):
+    response = client.post("/power/",
+                           json={"base": 10, "exponent": 1e6,
+                                 "precision": "log10"},
+                           headers=headers)
+    assert response.status_code == 201
+    assert response.json()["result"] == 1e6
+
+
+def test_power_approx_negative_base(client):
+    response = client.post("/power/",
+                           json={"base": -2, "exponent": 2001,
+                                 "precision": "approx"},
+                           headers=headers)
+    assert response.status_code == 201
+    result = response.json()["result"]
+    assert result["exponent"] == 602
+    assert result["mantissa"] < 0
+    assert str(-result["mantissa"]).replace(".", "")[:8] == \
+        str(2 ** 2001)[:8]
+
+
+def test_power_approx_not_real(client):
+    response = client.post("/power/",
+                           json={"base": -2, "exponent": 0.5,
+                                 "precision": "approx"},
+                           headers=headers)
+    assert response.status_code == 400
+
+
 def test_power_missing_api_key(client):
     response = client.post("/power/",
                            json={"base": 2, "exponent": 3})
@@ -103,3 +188,12 @@ def test_z_logs_include_power_success_and_error(client):
     )
     assert error_found, ("Expected power overflow "
                          "error log not found")
+
+
+def test_power_int_huge_exponent_rejected(client):
+    response = client.post("/power/",
+                           json={"base": 3, "exponent": 10 ** 400,
+                                 "mode": "int"},
+                           headers=headers)
+    assert response.status_code == 400
+    assert "too expensive" in response.json()["detail"]["message"]
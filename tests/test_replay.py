@@ -0,0 +1,83 @@
+import json
+import sqlite3
+
+from app.core.app_config import API_KEY
+from tools.replay import _percentile, read_db, read_jsonl, replay, to_http
+
+headers = {"X-API-Key": API_KEY}
+
+
+def _log_table(conn, name):
+    conn.execute(f"CREATE TABLE {name} (id INTEGER PRIMARY KEY, "
+                 f"operation VARCHAR, input JSON, timestamp DATETIME)")
+
+
+def test_to_http():
+    assert to_http({"operation": "factorial", "input": {"n": 5}}) == \
+        ("POST", "/factorial/", {"json": {"n": 5}})
+    assert to_http({"operation": "gcd.batch", "input": {"items": []}}) == \
+        ("POST", "/gcd/batch", {"json": {"items": []}})
+    assert to_http({"operation": "fibonacci.range",
+                    "input": {"stop": 3}}) == \
+        ("GET", "/fibonacci/range", {"params": {"stop": 3}})
+    assert to_http({"operation": "factorial.unknown", "input": {}}) is None
+
+
+def test_percentile():
+    values = [float(v) for v in range(1, 101)]
+    assert _percentile(values, 50) == 50.0
+    assert _percentile(values, 99) == 99.0
+    assert _percentile(values, 100) == 100.0
+    assert _percentile([7.0], 90) == 7.0
+
+
+def test_read_db_partitions_and_legacy_table(tmp_path):
+    path = tmp_path / "logs.db"
+    conn = sqlite3.connect(path)
+    for name in ("requests", "requests_20260318", "requests_20260317"):
+        _log_table(conn, name)
+    rows = [("requests", "factorial", "2026-03-10 09:00:00"),
+            ("requests_20260318", "power", "2026-03-18 08:00:00"),
+            ("requests_20260317", "gcd", "2026-03-17 08:00:01"),
+            ("requests_20260317", "fibonacci", "2026-03-17 08:00:00")]
+    for table, operation, timestamp in rows:
+        conn.execute(f"INSERT INTO {table} (operation, input, timestamp) "
+                     f"VALUES (?, '{{\"n\": 1}}', ?)", (operation, timestamp))
+    conn.execute("CREATE TABLE unrelated (id INTEGER)")
+    conn.commit()
+    conn.close()
+
+    records = list(read_db(str(path)))
+    assert [r["operation"] for r in records] == \
+        ["factorial", "fibonacci", "gcd", "power"]
+    assert records[0] == {"operation": "factorial", "input": {"n": 1},
+                          "timestamp": "2026-03-10 09:00:00"}
+
+
+def test_read_jsonl(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    record = {"operation": "gcd", "input": {"numbers": [4, 6]},
+              "timestamp": "2026-03-18T08:00:00"}
+    path.write_text(json.dumps(record) + "\n\n", encoding="utf-8")
+    assert list(read_jsonl(str(path))) == [record]
+
+
+def test_replay_in_process(client):
+    records = [
+        {"operation": "factorial", "input": {"n": 5},
+         "timestamp": "2026-03-18 08:00:00"},
+        {"operation": "fibonacci.batch", "input": {"items": [{"n": 10}]},
+         "timestamp": "2026-03-18 08:00:00.010"},
+        {"operation": "fibonacci.range", "input": {"stop": 5},
+         "timestamp": "2026-03-18 08:00:00.020"},
+        {"operation": "factorial.unknown", "input": {},
+         "timestamp": "2026-03-18 08:00:00.030"},
+        {"operation": "factorial", "input": {"n": -1},
+         "timestamp": "2026-03-18 08:00:00.040"},
+    ]
+    report = replay(records, client, headers, "original", speed=10.0)
+    assert report["skipped"] == 1
+    assert report["statuses"] == {201: 2, 200: 1, 400: 1}
+    assert sorted(report["latencies"]) == \
+        ["factorial", "fibonacci.batch", "fibonacci.range"]
+    assert len(report["latencies"]["factorial"]) == 2
@@ -0,0 +1,119 @@
+"""
+Benchmark per-request API-key overhead.
+
+Three minimal FastAPI apps serve the same trivial route:
+  • none        – no authentication (baseline)
+  • dependency  – the previous per-route `Security(APIKeyHeader)` check
+                  against one plaintext key
+  • middleware  – APIKeyMiddleware with the hashed key store
+                  (--keys N extra keys loaded in the index)
+Requests are driven straight through the ASGI interface (no sockets),
+so the numbers isolate framework + auth cost; each app is timed
+--rounds times and the best round is reported.
+
+Usage:  python tools/bench_auth.py [--requests 20000] [--keys 10000]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastapi import Depends, FastAPI, HTTPException, Security  # noqa: E402
+from fastapi.security.api_key import APIKeyHeader  # noqa: E402
+
+from app.core.api_security import (APIKeyMiddleware,  # noqa: E402
+                                   APIKeyStore, KeyRecord, hash_key)
+
+SECRET = "bench-secret"
+
+
+def _route(app: FastAPI, **kwargs) -> FastAPI:
+    @app.get("/factorial/", **kwargs)
+    async def endpoint():
+        return {"result": 120}
+    return app
+
+
+def build_none() -> FastAPI:
+    return _route(FastAPI())
+
+
+def build_dependency() -> FastAPI:
+    header = APIKeyHeader(name="X-API-Key", auto_error=False)
+
+    def verify_api_key(api_key: str = Security(header)) -> None:
+        if api_key is None:
+            raise HTTPException(status_code=401)
+        if api_key != SECRET:
+            raise HTTPException(status_code=403)
+
+    return _route(FastAPI(), dependencies=[Depends(verify_api_key)])
+
+
+def build_middleware(extra_keys: int) -> FastAPI:
+    store = APIKeyStore(legacy_key=SECRET)
+    index = dict(store._index)
+    for i in range(extra_keys):
+        digest = hash_key(f"tenant-{i}")
+        index[digest] = KeyRecord(f"tenant-{i}", digest, frozenset({"math"}))
+    store._index = index
+    app = _route(FastAPI())
+    app.add_middleware(APIKeyMiddleware, store=store)
+    return app
+
+
+async def _drive(app: FastAPI, requests: int) -> float:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": "/factorial/",
+        "raw_path": b"/factorial/", "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"bench"), (b"x-api-key", SECRET.encode())],
+        "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    status = []
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    for _ in range(200):  # warm-up (builds the middleware stack)
+        await app(dict(scope), receive, send)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    elapsed = time.perf_counter() - start
+    assert set(status) == {200}, set(status)
+    return elapsed / requests * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--keys", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    apps = {
+        "none": build_none(),
+        "dependency": build_dependency(),
+        f"middleware ({args.keys:,} keys)": build_middleware(args.keys),
+    }
+    baseline = None
+    for name, app in apps.items():
+        per_request = min(asyncio.run(_drive(app, args.requests))
+                          for _ in range(args.rounds))
+        if baseline is None:
+            baseline = per_request
+        print(f"{name:<26} {per_request:8.1f} µs/request  "
+              f"(auth overhead {per_request - baseline:+7.1f} µs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmark response compression: bytes on the wire vs CPU cost.
+
+Representative bodies are built with the real kernels and schemas:
+  • logs     – 300 CalculationResponse rows, as GET /logs returns them
+  • batch    – /fibonacci/batch for 10,000 items
+  • power    – GET /power/?base=3&exponent=200000&mode=int (exact digits)
+  • range    – /fibonacci/range?stop=1477 as NDJSON, compressed the way
+               the middleware streams it (flush after every chunk)
+Each body is encoded with identity, gzip (levels 1/6/9) and, if the
+brotli package is installed, brotli (qualities 1/4/9). The report lists
+compressed size, ratio, compress/decompress time, and the time the body
+spends on a --mbps link, so the CPU cost can be set against the
+transfer time it saves.
+
+Usage:  python tools/bench_compression.py [--mbps 10] [--repeat 5]
+"""
+import argparse
+import gzip
+import json
+import sys
+import time
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.controllers.operation_controller import (  # noqa: E402
+    RANGE_CHUNK_TERMS)
+from app.schemas.calculation_schema import (  # noqa: E402
+    CalculationResponse)
+from app.services.math_service import (fibonacci_batch,  # noqa: E402
+                                       fibonacci_range, int_to_decimal)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def _bodies() -> Dict[str, List[bytes]]:
+    now = datetime.now(timezone.utc)
+    logs = [CalculationResponse(operation="factorial", input={"n": n % 171},
+                                result=float(n), timestamp=now,
+                                status="success",
+                                message="Factorial calculated successfully")
+            .model_dump(mode="json") for n in range(300)]
+    batch = {"operation": "fibonacci.batch",
+             "input": {"items": [{"n": n % 1477} for n in range(10_000)]},
+             "results": [float(v) for v in fibonacci_batch(
+                 [n % 1477 for n in range(10_000)])],
+             "status": "success", "message": None}
+    power = {"operation": "power",
+             "input": {"base": 3, "exponent": 200_000, "mode": "int"},
+             "result": int_to_decimal(3 ** 200_000),
+             "status": "success"}
+    lines = [json.dumps({"n": n, "result": float(v)})
+             for n, v in fibonacci_range(0, 1477, 1)]
+    chunks = ["\n".join(lines[i:i + RANGE_CHUNK_TERMS]) + "\n"
+              for i in range(0, len(lines), RANGE_CHUNK_TERMS)]
+    return {
+        "logs": [json.dumps(logs).encode()],
+        "batch": [json.dumps(batch).encode()],
+        "power": [json.dumps(power).encode()],
+        "range": [chunk.encode() for chunk in chunks],
+    }
+
+
+Codec = Tuple[Callable[[List[bytes]], bytes], Callable[[bytes], bytes]]
+
+
+def _gzip(level: int) -> Codec:
+    def encode(chunks: List[bytes]) -> bytes:
+        encoder = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        out = [encoder.compress(c) + encoder.flush(zlib.Z_SYNC_FLUSH)
+               for c in chunks[:-1]]
+        out.append(encoder.compress(chunks[-1]) + encoder.flush())
+        return b"".join(out)
+    return encode, gzip.decompress
+
+
+def _brotli(quality: int) -> Codec:
+    def encode(chunks: List[bytes]) -> bytes:
+        encoder = brotli.Compressor(quality=quality)
+        out = [encoder.process(c) + encoder.flush() for c in chunks[:-1]]
+        out.append(encoder.process(chunks[-1]) + encoder.finish())
+        return b"".join(out)
+    return encode, brotli.decompress
+
+
+def _codecs() -> Dict[str, Codec]:
+    codecs: Dict[str, Codec] = {
+        "identity": (lambda chunks: b"".join(chunks), lambda data: data),
+    }
+    for level in (1, 6, 9):
+        codecs[f"gzip-{level}"] = _gzip(level)
+    if brotli is not None:
+        for quality in (1, 4, 9):
+            codecs[f"br-{quality}"] = _brotli(quality)
+    return codecs
+
+
+def _best(function: Callable[[], bytes], repeat: int) -> Tuple[float, bytes]:
+    best, result = float("inf"), b""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mbps", type=float, default=10.0,
+                        help="Link speed used for the transfer time")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    bytes_per_ms = args.mbps * 1e6 / 8 / 1000
+    codecs = _codecs()
+    if brotli is None:
+        print("brotli not installed: br rows skipped")
+    for name, chunks in _bodies().items():
+        raw = sum(len(chunk) for chunk in chunks)
+        print(f"\n{name}: {raw:,} bytes in {len(chunks)} chunk(s)")
+        print(f"  {'codec':<9} {'bytes':>11} {'ratio':>6} "
+              f"{'encode ms':>10} {'decode ms':>10} {'wire ms':>9} "
+              f"{'total ms':>9}")
+        for codec, (encode, decode) in codecs.items():
+            encode_ms, data = _best(lambda: encode(chunks), args.repeat)
+            decode_ms, plain = _best(lambda: decode(data), args.repeat)
+            assert len(plain) == raw
+            wire_ms = len(data) / bytes_per_ms
+            print(f"  {codec:<9} {len(data):>11,} {raw / len(data):6.1f} "
+                  f"{encode_ms:10.2f} {decode_ms:10.2f} {wire_ms:9.1f} "
+                  f"{encode_ms + decode_ms + wire_ms:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Benchmark per-request metrics overhead and /metrics scrape cost.
+
+Three minimal FastAPI apps serve the same routes:
+  • none             – no instrumentation (baseline)
+  • instrumentator   – prometheus-fastapi-instrumentator, as used before
+                       (skipped if the package is not installed)
+  • middleware       – MetricsMiddleware with thread-sharded metrics
+Requests are driven straight through the ASGI interface (no sockets)
+across --routes distinct route templates; each app is timed --rounds
+times and the best round is reported. The overhead is also expressed as
+the share of one CPU core it costs at --rps requests per second.
+
+Finally the Prometheus exposition is rendered uncached and through the
+cached path, to show what a scrape costs the server.
+
+Usage:  python tools/bench_metrics.py [--requests 20000] [--rps 10000]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastapi import FastAPI  # noqa: E402
+from prometheus_client import REGISTRY, generate_latest  # noqa: E402
+
+from app.core.metrics import ExpositionCache, MetricsMiddleware  # noqa: E402
+
+
+def _routes(app: FastAPI, count: int) -> FastAPI:
+    for i in range(count):
+        @app.get(f"/op{i}/")
+        async def endpoint():
+            return {"result": 120}
+    return app
+
+
+def build_none(routes: int) -> FastAPI:
+    return _routes(FastAPI(), routes)
+
+
+def build_instrumentator(routes: int):
+    try:
+        from prometheus_client import CollectorRegistry
+        from prometheus_fastapi_instrumentator import Instrumentator
+    except ImportError:
+        return None
+    app = _routes(FastAPI(), routes)
+    Instrumentator(registry=CollectorRegistry()).instrument(app)
+    return app
+
+
+def build_middleware(routes: int) -> FastAPI:
+    app = _routes(FastAPI(), routes)
+    app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def _drive(app: FastAPI, requests: int, routes: int) -> float:
+    scopes = []
+    for i in range(routes):
+        path = f"/op{i}/"
+        scopes.append({
+            "type": "http", "asgi": {"version": "3.0"},
+            "http_version": "1.1", "method": "GET", "scheme": "http",
+            "path": path, "raw_path": path.encode(), "root_path": "",
+            "query_string": b"", "headers": [(b"host", b"bench")],
+            "client": ("127.0.0.1", 1), "server": ("bench", 80),
+        })
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    status = []
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    for i in range(200):  # warm-up (builds the middleware stack)
+        await app(dict(scopes[i % routes]), receive, send)
+    start = time.perf_counter()
+    for i in range(requests):
+        await app(dict(scopes[i % routes]), receive, send)
+    elapsed = time.perf_counter() - start
+    assert set(status) == {200}, set(status)
+    return elapsed / requests * 1e6
+
+
+def _time_render(render, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        render()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--routes", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--rps", type=int, default=10_000)
+    args = parser.parse_args()
+
+    builders = {
+        "none": build_none,
+        "instrumentator": build_instrumentator,
+        "middleware": build_middleware,
+    }
+    baseline = None
+    for name, builder in builders.items():
+        app = builder(args.routes)
+        if app is None:
+            print(f"{name:<16} skipped (package not installed)")
+            continue
+        per_request = min(asyncio.run(_drive(app, args.requests,
+                                             args.routes))
+                          for _ in range(args.rounds))
+        if baseline is None:
+            baseline = per_request
+        overhead = per_request - baseline
+        core_share = overhead * args.rps / 1e6
+        print(f"{name:<16} {per_request:8.1f} µs/request  "
+              f"(overhead {overhead:+6.1f} µs = {core_share:6.1%} "
+              f"of a core at {args.rps:,} req/s)")
+
+    uncached = _time_render(lambda: generate_latest(REGISTRY), 200)
+    cache = ExpositionCache(ttl=60)
+    cache.render()
+    cached = _time_render(cache.render, 200)
+    size = len(generate_latest(REGISTRY))
+    print(f"scrape: {size:,} bytes, render {uncached:8.1f} µs uncached, "
+          f"{cached:6.2f} µs cached")
+
+
+if __name__ == "__main__":
+    main()
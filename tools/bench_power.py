@@ -0,0 +1,58 @@
+"""
+Benchmark the integer power kernels behind `/power?mode=int`.
+
+Prints, for growing exponent sizes, the time spent in
+  • modular exponentiation  pow(base, exponent, modulus)
+  • exact power             base ** exponent
+  • decimal formatting      int_to_decimal(result)
+next to the cost estimate the API uses to accept or reject the call.
+
+Usage:  python tools/bench_power.py [--modulus-bits 512]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.math_service import (MAX_POWER_COST,  # noqa: E402
+                                       int_to_decimal,
+                                       power_cost)
+
+EXPONENT_BITS = (1_000, 10_000, 100_000, 1_000_000)
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    value = fn()
+    return value, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--modulus-bits", type=int, default=512)
+    args = parser.parse_args()
+    modulus = (1 << args.modulus_bits) - 1
+
+    print(f"modulus: {args.modulus_bits} bits, "
+          f"cost budget: {MAX_POWER_COST:,}")
+    print(f"{'exp bits':>9} | {'modpow s':>9} {'cost':>14} | "
+          f"{'2**e s':>9} {'to str s':>9} {'cost':>14}")
+    for bits in EXPONENT_BITS:
+        huge = (1 << bits) - 1
+        _, t_mod = _timed(lambda: pow(3, huge, modulus))
+        mod_cost = power_cost(3, huge, "int", modulus)
+
+        # Exact powers: use `bits` as the exponent itself (result ~ bits)
+        exact, t_pow = _timed(lambda: 2 ** bits)
+        _, t_str = _timed(lambda: int_to_decimal(exact))
+        int_to_decimal.cache_clear()
+        exact_cost = power_cost(2, bits, "int")
+
+        print(f"{bits:>9,} | {t_mod:>9.4f} {mod_cost:>14,} | "
+              f"{t_pow:>9.4f} {t_str:>9.4f} {exact_cost:>14,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,17 @@ import sqlite3
 conn = sqlite3.connect("app/database.db")
 cursor = conn.cursor()
 
-cursor.execute("SELECT * FROM requests")
-rows = cursor.fetchall()
+# One table per log partition (requests_YYYYMMDD), oldest first
+cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' "
+               "AND name LIKE 'requests\\_%' ESCAPE '\\' ORDER BY name")
+partitions = [name for (name,) in cursor.fetchall()]
 
-for row in rows:
-    print(dict(zip([column[0] for column in cursor.description], row)))
+for partition in partitions:
+    print(f"-- {partition}")
+    cursor.execute(f"SELECT * FROM {partition}")
+    rows = cursor.fetchall()
+
+    for row in rows:
+        print(dict(zip([column[0] for column in cursor.description], row)))
 
 conn.close()
@@ -0,0 +1,221 @@
+"""
+Replay logged requests against the service and report latencies.
+
+Every call is recorded (operation, input, timestamp) in the request log,
+which makes it a production traffic trace. This tool re-issues that trace
+  • in-process (default, via FastAPI's TestClient) or
+  • against a running instance (--url http://localhost:8000)
+either at maximum speed or with the original inter-arrival times, scaled
+by --speed. It prints the latency distribution (overall and per
+operation), status codes and, in-process, the kernel cache hit rate.
+
+Sources:
+  --db app/database.db   read every requests_YYYYMMDD partition (and a
+                         legacy `requests` table not migrated yet)
+  --jsonl trace.jsonl    one {"operation", "input", "timestamp"} per line
+  --dump trace.jsonl     write the DB trace as JSONL instead of replaying
+
+Requests are sent one after another; with --timing original a request
+that is already late is sent immediately and the worst delay is reported
+as lag.
+Note that replayed calls are logged again by the target service.
+
+Usage:  python tools/replay.py --db app/database.db --timing original
+"""
+import argparse
+import json
+import sqlite3
+import statistics
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.app_config import API_KEY  # noqa: E402
+
+Record = Dict[str, Any]
+
+
+# Trace sources
+def read_db(path: str) -> Iterator[Record]:
+    """
+    Logged requests from every partition, oldest first. The legacy
+    `requests` table (older than any partition) is read first.
+    """
+    conn = sqlite3.connect(path)
+    cursor = conn.cursor()
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' "
+                   "AND (name = 'requests' OR name LIKE 'requests\\_%' "
+                   "ESCAPE '\\') ORDER BY name")
+    partitions = [name for (name,) in cursor.fetchall()]
+    for partition in partitions:
+        cursor.execute(f"SELECT operation, input, timestamp FROM {partition} "
+                       f"ORDER BY timestamp, id")
+        for operation, payload, timestamp in cursor.fetchall():
+            yield {"operation": operation,
+                   "input": json.loads(payload),
+                   "timestamp": timestamp}
+    conn.close()
+
+
+def read_jsonl(path: str) -> Iterator[Record]:
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _seconds(timestamp: Any) -> Optional[float]:
+    if timestamp is None:
+        return None
+    return datetime.fromisoformat(str(timestamp)).timestamp()
+
+
+def to_http(record: Record) -> Optional[Tuple[str, str, Dict[str, Any]]]:
+    """Map a log record to (method, path, request kwargs)."""
+    operation, _, kind = record["operation"].partition(".")
+    payload = record["input"]
+    if kind == "":
+        return "POST", f"/{operation}/", {"json": payload}
+    if kind == "batch":
+        return "POST", f"/{operation}/batch", {"json": payload}
+    if kind == "range":
+        return "GET", f"/{operation}/range", {"params": payload}
+    return None
+
+
+# Cache statistics (in-process only)
+def _cache_totals() -> Tuple[int, int]:
+    from app.services import math_service
+
+    hits = misses = 0
+    for value in vars(math_service).values():
+        info = getattr(value, "cache_info", None)
+        if callable(info):
+            stats = info()
+            hits += stats.hits
+            misses += stats.misses
+    return hits, misses
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    index = min(len(sorted_values) - 1,
+                max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _describe(latencies: List[float]) -> str:
+    ordered = sorted(latencies)
+    return (f"n={len(ordered):>6}  mean={statistics.fmean(ordered):8.2f}  "
+            f"p50={_percentile(ordered, 50):8.2f}  "
+            f"p90={_percentile(ordered, 90):8.2f}  "
+            f"p99={_percentile(ordered, 99):8.2f}  "
+            f"max={ordered[-1]:8.2f}  (ms)")
+
+
+def replay(records: List[Record], client: Any, headers: Dict[str, str],
+           timing: str, speed: float) -> Dict[str, Any]:
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    statuses: Counter = Counter()
+    skipped = 0
+    lag = 0.0
+
+    first_ts = _seconds(records[0].get("timestamp")) if records else None
+    started = time.perf_counter()
+    for record in records:
+        request = to_http(record)
+        if request is None:
+            skipped += 1
+            continue
+        if timing == "original" and first_ts is not None:
+            due = (_seconds(record["timestamp"]) - first_ts) / speed
+            wait = due - (time.perf_counter() - started)
+            if wait > 0:
+                time.sleep(wait)
+            else:
+                lag = max(lag, -wait)
+        method, path, kwargs = request
+        t0 = time.perf_counter()
+        # Both clients read the full body, so /range covers every term
+        response = client.request(method, path, headers=headers, **kwargs)
+        latencies[record["operation"]].append(
+            (time.perf_counter() - t0) * 1000)
+        statuses[response.status_code] += 1
+
+    return {"latencies": latencies, "statuses": statuses,
+            "skipped": skipped, "lag": lag,
+            "elapsed": time.perf_counter() - started}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--db", help="SQLite log database to read")
+    source.add_argument("--jsonl", help="JSONL trace to read")
+    parser.add_argument("--dump", help="Write the trace as JSONL and exit")
+    parser.add_argument("--url", help="Base URL of a running instance "
+                                      "(default: in-process)")
+    parser.add_argument("--api-key", default=API_KEY)
+    parser.add_argument("--timing", choices=("max", "original"),
+                        default="max")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Multiplier for original timing (2 = 2x faster)")
+    parser.add_argument("--limit", type=int, help="Replay only N requests")
+    args = parser.parse_args()
+
+    records = list(read_db(args.db) if args.db else read_jsonl(args.jsonl))
+    if args.limit:
+        records = records[:args.limit]
+
+    if args.dump:
+        with open(args.dump, "w", encoding="utf-8") as handle:
+            for record in records:
+                handle.write(json.dumps(record, default=str) + "\n")
+        print(f"wrote {len(records)} records to {args.dump}")
+        return
+
+    headers = {"X-API-Key": args.api_key}
+    if args.url:
+        import httpx
+
+        with httpx.Client(base_url=args.url) as client:
+            report = replay(records, client, headers, args.timing, args.speed)
+        cache = None
+    else:
+        from fastapi.testclient import TestClient
+        from app.main import app
+
+        with TestClient(app) as client:
+            before = _cache_totals()
+            report = replay(records, client, headers, args.timing, args.speed)
+            after = _cache_totals()
+        cache = (after[0] - before[0], after[1] - before[1])
+
+    sent = sum(len(v) for v in report["latencies"].values())
+    print(f"replayed {sent} requests in {report['elapsed']:.2f}s "
+          f"({sent / max(report['elapsed'], 1e-9):.0f} req/s), "
+          f"skipped {report['skipped']}, "
+          f"max lag {report['lag']:.2f}s")
+    print("status codes:", dict(sorted(report["statuses"].items())))
+    if sent:
+        everything = [ms for values in report["latencies"].values()
+                      for ms in values]
+        print(f"{'all':<18} {_describe(everything)}")
+        for operation, values in sorted(report["latencies"].items()):
+            print(f"{operation:<18} {_describe(values)}")
+    if cache is not None:
+        hits, misses = cache
+        total = hits + misses
+        rate = f"{hits / total:.1%}" if total else "n/a"
+        print(f"kernel cache: {hits} hits, {misses} misses, "
+              f"hit rate {rate}")
+    else:
+        print("kernel cache: n/a (remote target)")
+
+
+if __name__ == "__main__":
+    main()